@@ -1,6 +1,28 @@
 """Alphabetizer for a roster"""
+
+import heapq
+import multiprocessing
+import operator
+import sys
+import unicodedata
+
+# Consecutive wins by one run before a merge switches to galloping
+MIN_GALLOP = 7
+
+# Buckets this small are finished with insertion sort by the radix sort
+RADIX_CUTOFF = 16
+
+# Person fields a sort spec can name, and the directions it can sort them in
+SORT_FIELDS = ('first', 'last', 'email')
+ASCENDING = 'asc'
+DESCENDING = 'desc'
+
 class Person:
     """Class for a Person"""
+
+    # No per-instance __dict__, since rosters hold millions of people
+    __slots__ = ('first', 'last', 'email', 'collation')
+
     def __init__(self, first, last, email):
         self.first = first
         self.last = last
@@ -45,6 +67,213 @@ def order_last_name(a, b):
             return True
     return False
 
+def first_name_key(person):
+    """
+    Sort key equivalent to order_first_name
+    :param person: a Person
+    :return: a tuple ordering people by first name, then last name
+    """
+
+    return (person.first, person.last)
+
+def last_name_key(person):
+    """
+    Sort key equivalent to order_last_name
+    :param person: a Person
+    :return: a tuple ordering people by last name, then first name
+    """
+
+    return (person.last, person.first)
+
+def collate(text):
+    """
+    Computes a case-insensitive, Unicode-normalised form of a name
+    :param text: a string
+    :return: a string that compares the way a reader would expect
+    """
+
+    # https://docs.python.org/3/howto/unicode.html#comparing-strings
+
+    return unicodedata.normalize('NFKD', unicodedata.normalize('NFKD', text).casefold())
+
+def collation_key(person):
+    """
+    Gets the collated first and last names of a person
+    They are computed once and cached on the person, and recomputed only
+    if either name has been reassigned since
+    :param person: a Person
+    :return: a tuple of the collated first name and collated last name
+    """
+
+    try:
+        (first, last, first_key, last_key) = person.collation
+        if first is person.first and last is person.last:
+            return (first_key, last_key)
+    except AttributeError:
+        pass
+
+    first_key = collate(person.first)
+    last_key = collate(person.last)
+    person.collation = (person.first, person.last, first_key, last_key)
+    return (first_key, last_key)
+
+def first_name_collation_key(person):
+    """
+    Sort key equivalent to order_first_name_collated
+    :param person: a Person
+    :return: a tuple ordering people by collated first name, then last name
+    """
+
+    return collation_key(person)
+
+def last_name_collation_key(person):
+    """
+    Sort key equivalent to order_last_name_collated
+    :param person: a Person
+    :return: a tuple ordering people by collated last name, then first name
+    """
+
+    (first_key, last_key) = collation_key(person)
+    return (last_key, first_key)
+
+def order_first_name_collated(a, b):
+    """
+    Orders two people by their first names, ignoring case and Unicode normalisation
+    :param a: a Person
+    :param b: a Person
+    :return: True if a comes before b alphabetically and False otherwise
+    """
+
+    return collation_key(a) < collation_key(b)
+
+def order_last_name_collated(a, b):
+    """
+    Orders two people by their last names, ignoring case and Unicode normalisation
+    :param a: a Person
+    :param b: a Person
+    :return: True if a comes before b alphabetically and False otherwise
+    """
+
+    return last_name_collation_key(a) < last_name_collation_key(b)
+
+class ColumnarRoster:
+    """
+    A compact roster that stores first names, last names and emails in
+    parallel lists instead of one Person object per member
+    """
+
+    def __init__(self, roster=()):
+        """
+        Initializes the roster
+        :param roster: people to start the roster with
+        """
+
+        self.first = []
+        self.last = []
+        self.email = []
+
+        for person in roster:
+            self.append(person.first, person.last, person.email)
+
+    def append(self, first, last, email):
+        """
+        Adds a member to the end of the roster
+        Names repeat a lot, so they are interned and shared between members
+        :param first: the member's first name
+        :param last: the member's last name
+        :param email: the member's email
+        """
+
+        self.first.append(sys.intern(first))
+        self.last.append(sys.intern(last))
+        self.email.append(email)
+
+    def __len__(self):
+        """
+        Computes the number of members in the roster
+        :return: The size of the roster
+        """
+
+        return len(self.email)
+
+    def __getitem__(self, i):
+        """
+        Builds a Person for one member of the roster
+        :param i: the member's position
+        :return: a Person
+        """
+
+        return Person(self.first[i], self.last[i], self.email[i])
+
+    def __iter__(self):
+        """
+        Iterates over the members as Person objects, one at a time
+        :return: An iterator
+        """
+
+        for i in range(len(self)):
+            yield self[i]
+
+    def permuted(self, order):
+        """
+        Reorders the roster without building any Person objects
+        :param order: a list of positions, the new order of the members
+        :return: a new ColumnarRoster
+        """
+
+        roster = ColumnarRoster()
+        roster.first = [self.first[i] for i in order]
+        roster.last = [self.last[i] for i in order]
+        roster.email = [self.email[i] for i in order]
+        return roster
+
+def sort_key(spec):
+    """
+    Builds a composite sort key from a sort spec
+    For example [('last', 'asc'), ('email', 'desc')] sorts by last name,
+    then by email from Z to A
+    :param spec: a list of (field, direction) pairs, where field is one of
+    SORT_FIELDS and direction is ASCENDING or DESCENDING
+    :return: a function mapping a person to a tuple sort key
+    """
+
+    fields = []
+    for (field, direction) in spec:
+        if field not in SORT_FIELDS:
+            raise ValueError('cannot sort by {0!r}'.format(field))
+        if direction not in (ASCENDING, DESCENDING):
+            raise ValueError('unknown sort direction {0!r}'.format(direction))
+        fields.append((field, direction == DESCENDING))
+
+    def key(person):
+        return tuple(_descending(getattr(person, field)) if descending else getattr(person, field)
+                     for (field, descending) in fields)
+
+    return key
+
+class _Complements(dict):
+    """
+    A str.translate table mapping each character code to its complement
+    below U+10FFFF, filled in as new characters are seen
+    """
+
+    def __missing__(self, code):
+        self[code] = complement = chr(0x10FFFF - code)
+        return complement
+
+_COMPLEMENTS = _Complements()
+
+def _descending(text):
+    """
+    Maps a string to a key that sorts in reverse alphabetical order
+    :param text: a string
+    :return: a string of complemented characters
+    """
+
+    # The trailing U+10FFFF sorts above every complemented character, so that
+    # longer strings come before their own prefixes, as reverse order requires
+    return text.translate(_COMPLEMENTS) + '\U0010FFFF'
+
 def is_alphabetized(roster, ordering):
     """
     Checks whether the roster of names is alphabetized in the given order
@@ -116,3 +345,641 @@ def alphabetize(roster, ordering):
 
     return (list(roster), cost)
 
+
+
+
+def parallel_alphabetize(roster, ordering, processes=None, count=False):
+    """
+    Alphabetizes the roster by sorting partitions of it in a process pool
+    and merging the sorted partitions
+    Only compact data crosses between processes: workers get the sort keys
+    (or, for other orderings, the raw fields) of their partition and send
+    back the member positions in sorted order
+    :param roster: a list of people
+    :param ordering: a module-level function comparing two elements
+    :param processes: the number of worker processes, defaults to the CPU count
+    :param count: whether to count comparisons, which needs the much slower
+    Python merge sorts, see alphabetize_by_key
+    :return: a sorted version of roster
+    :return: the number of comparisons made, summed over all workers and the
+    merge, or None if count is False and ordering is a built-in ordering
+    """
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    # Not worth starting a pool for a single partition
+    if processes < 2 or len(roster) < 2 * processes:
+        if count or ordering not in _ORDERING_COLUMNS:
+            return alphabetize(roster, ordering)
+        return (sorted(roster, key=operator.attrgetter(*_ORDERING_COLUMNS[ordering])), None)
+
+    columns = _ORDERING_COLUMNS.get(ordering)
+    if columns is None:
+        # Other orderings need whole people, so send the fields to rebuild them from
+        data = [(person.first, person.last, person.email) for person in roster]
+    else:
+        data = list(map(operator.attrgetter(*columns), roster))
+
+    # Contiguous partitions keep the final merge stable
+    size = -(-len(roster) // processes)
+    jobs = [(data[i:i + size], i, ordering if columns is None else None, count)
+            for i in range(0, len(roster), size)]
+
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(_sort_partition, jobs)
+    orders = [order for (order, part_cost) in results]
+
+    if columns is not None and not count:
+        # The built-in sort finds the sorted partitions as runs and only merges them
+        order = [i for part in orders for i in part]
+        order.sort(key=data.__getitem__)
+        return ([roster[i] for i in order], None)
+
+    if columns is None:
+        merge = KWayMerge(orders, lambda i, j: ordering(roster[i], roster[j]))
+    else:
+        merge = KWayMerge(orders, lambda i, j: data[i] < data[j])
+    sorted_list = [roster[i] for i in merge]
+    cost = sum(part_cost for (order, part_cost) in results) + merge.cost
+
+    return (sorted_list, cost)
+
+def _sort_partition(data, start, ordering, count):
+    """
+    Sorts one partition for parallel_alphabetize in a worker process
+    :param data: key tuples, or (first, last, email) tuples if ordering is given
+    :param start: the roster position of the partition's first member
+    :param ordering: a function comparing two people, or None to compare keys
+    :param count: whether to count comparisons of keys
+    :return: the roster positions of the partition in sorted order
+    :return: the number of comparisons made, or None if none were counted
+    """
+
+    positions = range(start, start + len(data))
+
+    if ordering is not None:
+        people = [Person(*fields) for fields in data]
+        return alphabetize(list(positions), lambda i, j: ordering(people[i - start], people[j - start]))
+
+    if not count:
+        # Sorting positions by key is stable, and compares the keys in C
+        order = list(positions)
+        order.sort(key=lambda i: data[i - start])
+        return (order, None)
+
+    decorated = list(zip(data, positions))
+    cost = _merge_sort_keyed(decorated)
+    return ([i for (k, i) in decorated], cost)
+
+def alphabetize_top(roster, ordering, k):
+    """
+    Finds the first k people of the roster in the given ordering
+    without sorting the rest, using a heap of the best k seen so far
+    :param roster: an iterable of people
+    :param ordering: a function comparing two elements
+    :param k: the number of people wanted
+    :return: a sorted list of the first k people
+    :return: the number of comparisons made
+    """
+
+    # https://docs.python.org/3/library/heapq.html
+
+    counter = _Comparisons(ordering)
+    heap = []
+
+    # The heap root is the person who would be dropped first
+    for (index, person) in enumerate(roster):
+        if len(heap) < k:
+            heapq.heappush(heap, _TopEntry(counter, person, index))
+        elif k > 0:
+            counter.cost += 1
+            if ordering(person, heap[0].item):
+                heapq.heapreplace(heap, _TopEntry(counter, person, index))
+
+    # Popping gives the k people from last to first
+    top = []
+    while heap:
+        top.append(heapq.heappop(heap).item)
+    top.reverse()
+
+    return (top, counter.cost)
+
+def alphabetize_bottom_up(roster, ordering):
+    """
+    Alphabetizes the roster in place with an iterative bottom-up merge sort
+    Runs are merged back and forth between roster and a single auxiliary
+    buffer instead of allocating new halves at every level of recursion
+    :param roster: a list of people
+    :param ordering: a function comparing two elements
+    :return: a sorted version of roster
+    :return: the number of comparisons made
+    """
+
+    cost = 0
+    n = len(roster)
+    src = roster
+    dst = [None] * n
+
+    # Merge adjacent runs of width 1, 2, 4, ... from src into dst
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i = lo
+            j = mid
+            k = lo
+
+            while i < mid and j < hi:
+                if ordering(src[j], src[i]):
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+                cost += 1
+
+            # Copy whichever run has leftovers
+            if i < mid:
+                dst[k:hi] = src[i:mid]
+            else:
+                dst[k:hi] = src[j:hi]
+
+        (src, dst) = (dst, src)
+        width *= 2
+
+    # The last pass may have left the result in the auxiliary buffer
+    if src is not roster:
+        roster[:] = src
+
+    return (roster, cost)
+
+def alphabetize_adaptive(roster, ordering):
+    """
+    Alphabetizes the roster in place with a natural merge sort
+    Existing ascending (or strictly descending) runs are detected and only
+    those runs are merged, galloping through whichever run dominates, so a
+    nearly sorted roster costs close to a linear number of comparisons
+    :param roster: a list of people
+    :param ordering: a function comparing two elements
+    :return: a sorted version of roster
+    :return: the number of comparisons made
+    """
+
+    # https://github.com/python/cpython/blob/main/Objects/listsort.txt
+
+    cost = 0
+    n = len(roster)
+
+    # Split the roster into maximal runs, reversing descending ones
+    bounds = [0]
+    i = 0
+    while i < n:
+        j = i + 1
+        if j < n:
+            cost += 1
+            if ordering(roster[j], roster[i]):
+                j += 1
+                while j < n:
+                    cost += 1
+                    if not ordering(roster[j], roster[j - 1]):
+                        break
+                    j += 1
+                roster[i:j] = roster[i:j][::-1]
+            else:
+                j += 1
+                while j < n:
+                    cost += 1
+                    if ordering(roster[j], roster[j - 1]):
+                        break
+                    j += 1
+        bounds.append(j)
+        i = j
+
+    # Merge neighbouring runs pairwise until a single run is left
+    while len(bounds) > 2:
+        merged = [0]
+        for r in range(0, len(bounds) - 2, 2):
+            cost += _merge_galloping(roster, bounds[r], bounds[r + 1], bounds[r + 2], ordering)
+            merged.append(bounds[r + 2])
+        if len(bounds) % 2 == 0:
+            merged.append(bounds[-1])
+        bounds = merged
+
+    return (roster, cost)
+
+def _merge_galloping(roster, lo, mid, hi, ordering):
+    """
+    Merges the sorted runs roster[lo:mid] and roster[mid:hi] in place
+    :param roster: a list of people
+    :param lo: start of the left run
+    :param mid: end of the left run and start of the right run
+    :param hi: end of the right run
+    :param ordering: a function comparing two elements
+    :return: the number of comparisons made
+    """
+
+    cost = 0
+
+    # Left elements that do not come after the right run's head are in place
+    head = roster[mid]
+    (lo, c) = _gallop(lambda x: not ordering(head, x), roster, lo, mid)
+    cost += c
+    if lo == mid:
+        return cost
+
+    # Right elements that do not come before the left run's tail are in place
+    tail = roster[mid - 1]
+    (hi, c) = _gallop(lambda x: ordering(x, tail), roster, mid, hi)
+    cost += c
+
+    left = roster[lo:mid]
+    i = 0
+    j = mid
+    k = lo
+
+    while i < len(left) and j < hi:
+
+        # Merge one element at a time until one run wins MIN_GALLOP times in a row
+        left_wins = right_wins = 0
+        while i < len(left) and j < hi:
+            cost += 1
+            if ordering(roster[j], left[i]):
+                roster[k] = roster[j]
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                roster[k] = left[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+
+        # Gallop, copying whole chunks, until neither run keeps winning
+        while i < len(left) and j < hi:
+            b = roster[j]
+            (end, c) = _gallop(lambda x: not ordering(b, x), left, i, len(left))
+            cost += c
+            left_count = end - i
+            roster[k:k + left_count] = left[i:end]
+            k += left_count
+            i = end
+            if i == len(left):
+                break
+
+            a = left[i]
+            (end, c) = _gallop(lambda x: ordering(x, a), roster, j, hi)
+            cost += c
+            right_count = end - j
+            roster[k:k + right_count] = roster[j:end]
+            k += right_count
+            j = end
+
+            if left_count < MIN_GALLOP and right_count < MIN_GALLOP:
+                break
+
+    # Leftover right elements are already in place
+    roster[k:k + len(left) - i] = left[i:]
+
+    return cost
+
+def _gallop(pred, items, lo, hi):
+    """
+    Finds where pred stops holding in items[lo:hi]
+    pred must hold for a prefix of the range and fail for the rest
+    :param pred: a bool function over one element
+    :param items: a list
+    :param lo: start of the range
+    :param hi: end of the range
+    :return: the first index in the range whose element fails pred
+    :return: the number of comparisons made
+    """
+
+    cost = 0
+
+    # Probe at offsets 0, 1, 3, 7, ... to bracket the boundary
+    first = lo
+    last = hi
+    offset = 0
+    while lo + offset < hi:
+        cost += 1
+        if not pred(items[lo + offset]):
+            last = lo + offset
+            break
+        first = lo + offset + 1
+        offset = offset * 2 + 1
+
+    # Binary search inside the bracket
+    while first < last:
+        m = (first + last) // 2
+        cost += 1
+        if pred(items[m]):
+            first = m + 1
+        else:
+            last = m
+
+    return (first, cost)
+
+def alphabetize_by_key(roster, key, count=False):
+    """
+    Alphabetizes the roster by a sort key computed once per person
+    :param roster: a list of people
+    :param key: a function mapping a person to a comparable sort key
+    :param count: whether to count comparisons, which needs the much slower
+    Python merge sort instead of the built-in sort
+    :return: a sorted version of roster
+    :return: the number of comparisons made, or None if count is False
+    """
+
+    if not count:
+        # The built-in sort is stable too, and compares the keys in C
+        return (sorted(roster, key=key), None)
+
+    # Decorate each person with its key so the merge only compares tuples
+    decorated = [(key(person), person) for person in roster]
+    cost = _merge_sort_keyed(decorated)
+
+    return ([person for (k, person) in decorated], cost)
+
+# Columns that make up the sort key of each built-in ordering
+_ORDERING_COLUMNS = {
+    order_first_name: ('first', 'last'),
+    order_last_name: ('last', 'first'),
+}
+
+def alphabetize_columnar(roster, ordering, count=False):
+    """
+    Alphabetizes a ColumnarRoster by sorting member positions
+    rather than moving Person objects around
+    :param roster: a ColumnarRoster
+    :param ordering: a function comparing two elements
+    :param count: whether to count comparisons under a built-in ordering,
+    see alphabetize_by_key
+    :return: a sorted version of roster
+    :return: the number of comparisons made, or None if count is False and
+    ordering is a built-in ordering
+    """
+
+    columns = _ORDERING_COLUMNS.get(ordering)
+
+    if columns is None:
+        # Unknown orderings have to compare whole people, so build each one once
+        people = list(roster)
+        (order, cost) = alphabetize(list(range(len(roster))),
+                                    lambda i, j: ordering(people[i], people[j]))
+        return (roster.permuted(order), cost)
+
+    # Built-in orderings compare key tuples zipped straight from the columns
+    keys = list(zip(*(getattr(roster, column) for column in columns)))
+    if not count:
+        order = sorted(range(len(roster)), key=keys.__getitem__)
+        return (roster.permuted(order), None)
+
+    decorated = list(zip(keys, range(len(roster))))
+    cost = _merge_sort_keyed(decorated)
+    order = [i for (k, i) in decorated]
+
+    return (roster.permuted(order), cost)
+
+def alphabetize_by_spec(roster, spec, count=False):
+    """
+    Alphabetizes the roster in one pass by any combination of fields
+    Each person's composite key is computed once, and people with equal
+    keys keep their roster order
+    :param roster: a list of people
+    :param spec: a list of (field, direction) pairs, see sort_key
+    :param count: whether to count comparisons, see alphabetize_by_key
+    :return: a sorted version of roster
+    :return: the number of comparisons made, or None if count is False
+    """
+
+    return alphabetize_by_key(roster, sort_key(spec), count)
+
+def _merge_sort_keyed(items):
+    """
+    Merge sorts a list of (key, value) pairs in place by key
+    :param items: a list of (key, value) pairs
+    :return: the number of comparisons made
+    """
+
+    cost = 0
+
+    if len(items) > 1:
+
+        # Split the list into two halves
+        a = items[:len(items) // 2]
+        b = items[len(items) // 2:]
+
+        cost += _merge_sort_keyed(a)
+        cost += _merge_sort_keyed(b)
+
+        i = j = k = 0
+
+        # Only take from the second half when it is strictly smaller, for stability
+        while i < len(a) and j < len(b):
+            if b[j][0] < a[i][0]:
+                items[k] = b[j]
+                j += 1
+            else:
+                items[k] = a[i]
+                i += 1
+            k += 1
+            cost += 1
+
+        # Copy whichever half has leftovers
+        items[k:] = a[i:] if i < len(a) else b[j:]
+
+    return cost
+
+def alphabetize_radix(roster, ordering):
+    """
+    Alphabetizes the roster with a most-significant-character radix sort
+    on the key string of each person, finishing small buckets with
+    insertion sort
+    :param roster: a list of people
+    :param ordering: order_first_name or order_last_name
+    :return: a sorted version of roster
+    :return: the number of characters inspected plus comparisons made
+    """
+
+    # https://algs4.cs.princeton.edu/51radix/
+
+    columns = _ORDERING_COLUMNS.get(ordering)
+    if columns is None:
+        raise ValueError('radix sort needs a built-in ordering')
+
+    # Joining with '\0', which sorts below every other character, keeps
+    # (first, last) tuple order for names without control characters
+    items = [('\0'.join(getattr(person, column) for column in columns), person)
+             for person in roster]
+
+    cost = 0
+    stack = [(0, len(items), 0)]
+    while stack:
+        (lo, hi, depth) = stack.pop()
+
+        if hi - lo <= RADIX_CUTOFF:
+            cost += _insertion_sort_keyed(items, lo, hi)
+            continue
+
+        # Distribute by the character at depth, keeping keys that end here first
+        ended = []
+        buckets = {}
+        for item in items[lo:hi]:
+            cost += 1
+            if depth < len(item[0]):
+                buckets.setdefault(item[0][depth], []).append(item)
+            else:
+                ended.append(item)
+
+        items[lo:lo + len(ended)] = ended
+        start = lo + len(ended)
+        for char in sorted(buckets):
+            bucket = buckets[char]
+            items[start:start + len(bucket)] = bucket
+            if len(bucket) > 1:
+                stack.append((start, start + len(bucket), depth + 1))
+            start += len(bucket)
+
+    return ([person for (key, person) in items], cost)
+
+def _insertion_sort_keyed(items, lo, hi):
+    """
+    Insertion sorts items[lo:hi], a slice of (key, person) pairs, by key
+    :param items: a list of (key, person) pairs
+    :param lo: start of the slice
+    :param hi: end of the slice
+    :return: the number of comparisons made
+    """
+
+    cost = 0
+
+    for i in range(lo + 1, hi):
+        item = items[i]
+        j = i
+        while j > lo:
+            cost += 1
+            if not item[0] < items[j - 1][0]:
+                break
+            items[j] = items[j - 1]
+            j -= 1
+        items[j] = item
+
+    return cost
+
+class KWayMerge:
+    """
+    Lazily merges several sorted runs into a single sorted stream
+    """
+
+    def __init__(self, runs, ordering):
+        """
+        :param runs: iterables of people, each sorted by ordering
+        :param ordering: a function comparing two elements
+        """
+
+        self.runs = [iter(run) for run in runs]
+        self.ordering = ordering
+        self.cost = 0
+
+    def __iter__(self):
+        """
+        Yields the people of every run in sorted order
+        Ties are broken by run position so the merge is stable
+        :return: An iterator
+        """
+
+        # https://docs.python.org/3/library/heapq.html
+
+        heap = []
+        for (index, run) in enumerate(self.runs):
+            for e in run:
+                heap.append(_MergeEntry(self, e, index, run))
+                break
+        heapq.heapify(heap)
+
+        while heap:
+            entry = heap[0]
+            yield entry.item
+
+            # Refill the entry from its run, or drop it once the run is used up
+            for e in entry.run:
+                entry.item = e
+                heapq.heapreplace(heap, entry)
+                break
+            else:
+                heapq.heappop(heap)
+
+
+class _MergeEntry:
+    """
+    Head of one run inside a KWayMerge heap
+    """
+
+    __slots__ = ('merge', 'item', 'index', 'run')
+
+    def __init__(self, merge, item, index, run):
+        self.merge = merge
+        self.item = item
+        self.index = index
+        self.run = run
+
+    def __lt__(self, other):
+        self.merge.cost += 1
+        if self.merge.ordering(self.item, other.item):
+            return True
+        self.merge.cost += 1
+        if self.merge.ordering(other.item, self.item):
+            return False
+        return self.index < other.index
+
+
+class _Comparisons:
+    """
+    An ordering together with a count of how often it has been used
+    """
+
+    __slots__ = ('ordering', 'cost')
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+        self.cost = 0
+
+
+class _TopEntry:
+    """
+    A candidate inside the alphabetize_top heap
+    Entries that come later in the ordering sort first, so the heap root
+    is the worst of the people kept so far
+    """
+
+    __slots__ = ('counter', 'item', 'index')
+
+    def __init__(self, counter, item, index):
+        self.counter = counter
+        self.item = item
+        self.index = index
+
+    def __lt__(self, other):
+        self.counter.cost += 1
+        if self.counter.ordering(other.item, self.item):
+            return True
+        self.counter.cost += 1
+        if self.counter.ordering(self.item, other.item):
+            return False
+        return self.index > other.index
+
+
+# Sort engines that take (roster, ordering) and return (sorted_list, cost)
+ENGINES = {
+    'merge': alphabetize,
+    'bottom_up': alphabetize_bottom_up,
+    'adaptive': alphabetize_adaptive,
+    'parallel': parallel_alphabetize,
+    'radix': alphabetize_radix,
+}
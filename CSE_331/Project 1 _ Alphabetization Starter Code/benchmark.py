@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+""" Benchmarks the alphabetizer sort engines on synthetic rosters.
+    Wall time, peak memory and comparison cost are reported as JSON so runs
+    of different versions can be compared.
+
+    python3 benchmark.py --sizes 1000 100000 --engines merge radix --output results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from alphabetizer import *
+
+SYLLABLES = ['al', 'an', 'ar', 'be', 'bo', 'ca', 'da', 'de', 'el', 'en', 'fi', 'ga',
+             'ha', 'he', 'in', 'ja', 'ka', 'la', 'li', 'lo', 'ma', 'mi', 'na', 'ne',
+             'or', 'pa', 'ra', 're', 'ri', 'ro', 'sa', 'si', 'ta', 'th', 'to', 'va']
+
+# Each ordering with the sort key a presorted roster is generated in
+ORDERINGS = {
+    'first': (order_first_name, first_name_key),
+    'last': (order_last_name, last_name_key),
+}
+
+
+def _name(rng):
+    return ''.join(rng.choice(SYLLABLES) for i in range(rng.randint(2, 4))).capitalize()
+
+
+def generate_roster(n, duplicate_rate=0.0, presortedness=0.0, seed=0, key=first_name_key):
+    """
+    Builds a reproducible synthetic roster
+    :param n: the number of people
+    :param duplicate_rate: fraction of people that copy an earlier person's names
+    :param presortedness: fraction of the roster left in key order,
+    the rest is scattered by random swaps
+    :param seed: seed for the random number generator
+    :param key: the sort key a presorted roster is ordered by
+    :return: a list of people
+    """
+
+    rng = random.Random(seed)
+
+    roster = []
+    for i in range(n):
+        if roster and rng.random() < duplicate_rate:
+            twin = roster[rng.randrange(len(roster))]
+            (first, last) = (twin.first, twin.last)
+        else:
+            (first, last) = (_name(rng), _name(rng))
+        roster.append(Person(first, last, '{0}{1}{2}@hogwarts.edu'.format(first[0], last, i).lower()))
+
+    if presortedness > 0:
+        (roster, cost) = alphabetize_by_key(roster, key)
+        for i in range(int(n * (1 - presortedness) / 2)):
+            (a, b) = (rng.randrange(n), rng.randrange(n))
+            (roster[a], roster[b]) = (roster[b], roster[a])
+    else:
+        rng.shuffle(roster)
+
+    return roster
+
+
+def measure(engine, roster, ordering, trace_memory=True):
+    """
+    Sorts a copy of the roster with one engine and records what it cost
+    Peak memory is taken from a second, traced run so tracing does not
+    slow down the timed one. It only covers the current process.
+    :param engine: a sort function taking (roster, ordering)
+    :param roster: a list of people
+    :param ordering: a function comparing two elements
+    :param trace_memory: whether to measure peak memory
+    :return: a dict of seconds, peak_bytes and cost
+    """
+
+    start = time.perf_counter()
+    (sorted_list, cost) = engine(list(roster), ordering)
+    seconds = time.perf_counter() - start
+
+    # Ties are allowed here, since duplicated names have different emails
+    if any(ordering(sorted_list[i], sorted_list[i - 1]) for i in range(1, len(sorted_list))):
+        raise AssertionError('{0} did not sort the roster'.format(engine.__name__))
+
+    peak = None
+    if trace_memory:
+        copy = list(roster)
+        tracemalloc.start()
+        engine(copy, ordering)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_bytes': peak, 'cost': cost}
+
+
+def run(sizes, engines, duplicate_rate, presortedness, seed, trace_memory):
+    """
+    Benchmarks every engine under both orderings on rosters of each size
+    Each ordering gets its own roster, presorted by that ordering's key
+    :param sizes: roster sizes to generate
+    :param engines: names of engines in ENGINES
+    :param duplicate_rate: passed to generate_roster
+    :param presortedness: passed to generate_roster
+    :param seed: passed to generate_roster
+    :param trace_memory: whether to measure peak memory
+    :return: a JSON-serialisable dict of the results
+    """
+
+    results = []
+    for n in sizes:
+        for (order_name, (ordering, key)) in ORDERINGS.items():
+            roster = generate_roster(n, duplicate_rate, presortedness, seed, key)
+            for name in engines:
+                result = measure(ENGINES[name], roster, ordering, trace_memory)
+                result.update({'engine': name, 'ordering': order_name, 'size': n})
+                results.append(result)
+                print('{0:>10} {1:>6} {2:>10} {3:8.3f}s'.format(name, order_name, n, result['seconds']),
+                      file=sys.stderr)
+
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'duplicate_rate': duplicate_rate,
+        'presortedness': presortedness,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=['merge'])
+    parser.add_argument('--duplicate-rate', type=float, default=0.0)
+    parser.add_argument('--presortedness', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced peak memory run')
+    parser.add_argument('--output', help='file to write JSON to, instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.engines, args.duplicate_rate, args.presortedness,
+                 args.seed, not args.no_memory)
+
+    if args.output:
+        with open(args.output, 'w') as writer:
+            json.dump(report, writer, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,227 @@
 #!/usr/bin/python3
 
+import concurrent.futures
+import contextlib
+import itertools
+import mmap
+import os
+import tempfile
+
 from alphabetizer import *
+from rosterindex import RosterIndex
+from rostercache import save_cache, load_cache
+
+# Bytes of file buffering used when streaming rosters in and out
+BUFFER_SIZE = 1 << 20
+
+# Number of people formatted per write by write_file
+WRITE_BATCH = 4096
+
+
+def split_line(line):
+    (first, last, email) = line.split()
+    return (first, last, email[1:-1])
+
+
+def parse_line(line):
+    return Person(*split_line(line))
+
+
+def stream_file(filename, buffer_size=BUFFER_SIZE, use_mmap=False):
+    """
+    Lazily reads the people in a roster file, one line at a time
+    :param filename: name of the roster file
+    :param buffer_size: bytes read from disk at a time
+    :param use_mmap: read through a memory map instead of buffered reads
+    :return: An iterator of people
+    """
+
+    if use_mmap:
+        yield from _stream_mmap(filename)
+        return
+
+    with open(filename, 'r', buffering=buffer_size) as reader:
+        for line in reader:
+            if line.strip():
+                yield parse_line(line)
+
+
+def _stream_mmap(filename):
+    with open(filename, 'rb') as reader:
+
+        # Empty files cannot be mapped
+        if os.fstat(reader.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                if line.strip():
+                    yield parse_line(line.decode())
+
+    
+def load_file(filename, use_mmap=False):
+    return list(stream_file(filename, use_mmap=use_mmap))
     
-def load_file(filename):
-    members = []
+def load_columnar(filename):
+    members = ColumnarRoster()
     with open(filename, 'r') as reader:
         for line in reader:
             if line.strip():
-                (first, last, email) = line.split()
-                members.append(Person(first, last, email[1:-1]))
+                members.append(*split_line(line))
     return members
+
+def cached_roster(filename, cachefile=None):
+    """
+    Loads a roster through its binary cache, rebuilding the cache
+    whenever the roster file has changed
+    :param filename: name of the roster file
+    :param cachefile: name of the cache file, defaults to filename + '.cache'
+    :return: a CachedRoster
+    """
+
+    if cachefile is None:
+        cachefile = filename + '.cache'
+
+    roster = load_cache(cachefile, filename)
+    if roster is None:
+        stat = os.stat(filename)
+        save_cache(cachefile, load_file(filename), stat)
+        roster = load_cache(cachefile, filename)
+    return roster
+
+def load_indexed(filename):
+    return RosterIndex(stream_file(filename))
     
-def write_file(filename, memberlist):
-    with open(filename, 'w') as writer:
-        writer.writelines(str(member) + '\n' for member in memberlist)
-            
+def write_file(filename, memberlist, buffer_size=BUFFER_SIZE):
+    """
+    Writes people to a roster file, formatting them in batches so each
+    batch reaches the file in a single write
+    :param filename: name of the roster file
+    :param memberlist: an iterable of people, which may be a generator
+    :param buffer_size: bytes buffered before writing to disk
+    """
+
+    members = iter(memberlist)
+    with open(filename, 'w', buffering=buffer_size) as writer:
+        while True:
+            batch = list(itertools.islice(members, WRITE_BATCH))
+            if not batch:
+                break
+            writer.write(''.join([str(member) + '\n' for member in batch]))
+
+
+def external_alphabetize(infile, outfile, ordering, run_size=100000):
+    """
+    Alphabetizes a roster file without holding the whole roster in memory
+    Sorted runs of at most run_size people are spilled to temporary files
+    and then k-way merged into outfile
+    :param infile: name of the roster file to sort
+    :param outfile: name of the file the sorted roster is written to
+    :param ordering: a function comparing two elements
+    :param run_size: the most people held in memory at once
+    :return: the number of comparisons made
+    """
+
+    cost = 0
+
+    with tempfile.TemporaryDirectory() as run_dir:
+
+        # Sort bounded runs of the input and spill each one to disk
+        run_files = []
+        members = stream_file(infile)
+        while True:
+            run = list(itertools.islice(members, run_size))
+            if not run:
+                break
+            (run, run_cost) = alphabetize(run, ordering)
+            cost += run_cost
+            run_file = os.path.join(run_dir, 'run{0}.txt'.format(len(run_files)))
+            write_file(run_file, run)
+            run_files.append(run_file)
+
+        # Merge the runs back together, streaming straight to the output
+        with contextlib.ExitStack() as stack:
+            runs = [stack.enter_context(contextlib.closing(stream_file(f))) for f in run_files]
+            merge = KWayMerge(runs, ordering)
+            write_file(outfile, merge)
+        cost += merge.cost
+
+    return cost
+
+
+
+def merge_files(infiles, outfile, ordering, threads=4, processes=None):
+    """
+    Alphabetizes several roster files into one output file
+    Files are read on a thread pool, then parsed, sorted and spilled to a
+    temporary file on a process pool, before the spilled rosters are k-way
+    merged into outfile, so at most one roster per thread is in memory at a
+    time and no people are pickled between processes
+    :param infiles: names of the roster files to combine
+    :param outfile: name of the file the merged roster is written to
+    :param ordering: a module-level function comparing two elements
+    :param threads: the number of files loaded at once
+    :param processes: the number of sorting processes, defaults to the CPU count
+    :return: the number of comparisons made
+    """
+
+    with tempfile.TemporaryDirectory() as run_dir:
+        run_files = [os.path.join(run_dir, 'run{0}.txt'.format(i)) for i in range(len(infiles))]
+
+        with concurrent.futures.ThreadPoolExecutor(threads) as loaders, \
+                concurrent.futures.ProcessPoolExecutor(processes) as sorters:
+            costs = loaders.map(_load_sort_spill, infiles, run_files,
+                                itertools.repeat(ordering), itertools.repeat(sorters))
+            cost = sum(costs)
+
+        # Merge the sorted runs in input order so equal people keep file order
+        with contextlib.ExitStack() as stack:
+            runs = [stack.enter_context(contextlib.closing(stream_file(f))) for f in run_files]
+            merge = KWayMerge(runs, ordering)
+            write_file(outfile, merge)
+        cost += merge.cost
+
+    return cost
+
+
+def _load_sort_spill(infile, run_file, ordering, sorters):
+    # Only raw lines go to the sorting process, and only the cost comes back
+    with open(infile, 'r', buffering=BUFFER_SIZE) as reader:
+        lines = [line for line in reader if line.strip()]
+    return sorters.submit(_sort_spill, lines, run_file, ordering).result()
+
+def _sort_spill(lines, run_file, ordering):
+    (sorted_list, cost) = alphabetize([parse_line(line) for line in lines], ordering)
+    write_file(run_file, sorted_list)
+    return cost
 
-def main(infile, outfile):
+def main(infile, outfile, run_size=None, processes=1, use_cache=False, engine='merge'):
     order = order_first_name
     #order = order_last_name
+    if use_cache:
+        with cached_roster(infile) as roster:
+            write_file(outfile, roster.ordered(order))
+        print(0, 'comparisons were required')
+        return
+    if run_size is not None:
+        cost = external_alphabetize(infile, outfile, order, run_size)
+        print(cost, 'comparisons were required')
+        return
     member_list = load_file(infile)
-    (sorted_list, cost) = alphabetize(member_list, order)
+    if processes == 1:
+        (sorted_list, cost) = ENGINES[engine](member_list, order)
+    else:
+        (sorted_list, cost) = parallel_alphabetize(member_list, order, processes)
     if not is_alphabetized(sorted_list, order):
         print('Sorting was not successful!')
-    print(cost, 'comparisons were required')
+    if cost is not None:
+        print(cost, 'comparisons were required')
     write_file(outfile, sorted_list)
     
 if __name__ == '__main__':
     main('gryffindor.txt', 'sorted.txt')
     #main('short.txt', 'sorted.txt')
+    #main('gryffindor.txt', 'sorted.txt', run_size=10)
+    #main('gryffindor.txt', 'sorted.txt', processes=None)
+    #main('gryffindor.txt', 'sorted.txt', use_cache=True)
+    #main('gryffindor.txt', 'sorted.txt', engine='radix')
@@ -0,0 +1,203 @@
+""" This module saves a parsed, alphabetized roster in a compact binary file
+    that can be memory mapped back in, so a roster that has not changed
+    does not need to be parsed or sorted again.
+
+    File layout, all integers in native byte order:
+        header          magic, version, source size, source mtime, member count
+        offsets         3n + 1 uint64 offsets of each name and email in the text
+        by first name   n uint32 member positions in order_first_name order
+        by last name    n uint32 member positions in order_last_name order
+        text            the UTF-8 encoded names and emails back to back
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+from alphabetizer import Person, order_first_name, order_last_name, \
+    alphabetize_by_key, first_name_key, last_name_key
+
+MAGIC = b'RSTR'
+VERSION = 1
+
+# magic, version, source size, source mtime in ns, member count
+HEADER = struct.Struct('=4sIQqQ')
+
+
+def save_cache(cachefile, roster, stat):
+    """
+    Writes a roster and both of its orderings to a cache file
+    The file is written under a temporary name and renamed into place, so
+    an interrupted write never leaves a partial cache behind
+    :param cachefile: name of the cache file to write
+    :param roster: a list of people
+    :param stat: os.stat of the source file, taken before it was read, so
+    a source changed while it was being read leaves the cache stale
+    """
+
+    # Pack every field into one text blob, remembering where each one starts
+    offsets = [0]
+    chunks = []
+    for person in roster:
+        for field in (person.first, person.last, person.email):
+            chunk = field.encode('utf-8')
+            chunks.append(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+
+    positions = list(range(len(roster)))
+    (by_first, cost) = alphabetize_by_key(positions, lambda i: first_name_key(roster[i]))
+    (by_last, cost) = alphabetize_by_key(positions, lambda i: last_name_key(roster[i]))
+
+    (fd, temp) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cachefile)), suffix='.tmp')
+    try:
+        with open(fd, 'wb') as writer:
+            writer.write(HEADER.pack(MAGIC, VERSION, stat.st_size, stat.st_mtime_ns, len(roster)))
+            writer.write(array('Q', offsets).tobytes())
+            writer.write(array('I', by_first).tobytes())
+            writer.write(array('I', by_last).tobytes())
+            writer.write(b''.join(chunks))
+        os.replace(temp, cachefile)
+    except BaseException:
+        os.remove(temp)
+        raise
+
+
+def load_cache(cachefile, source):
+    """
+    Memory maps a cache file if it is still up to date with its source
+    :param cachefile: name of the cache file
+    :param source: name of the text file the roster was loaded from
+    :return: a CachedRoster, or None if the cache is missing or stale
+    """
+
+    try:
+        roster = CachedRoster(cachefile)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        stat = os.stat(source)
+    except OSError:
+        roster.close()
+        raise
+
+    if roster.source_size != stat.st_size or roster.source_mtime != stat.st_mtime_ns:
+        roster.close()
+        return None
+
+    return roster
+
+
+class CachedRoster:
+    """
+    A read-only roster memory mapped from a cache file
+    People are only decoded when they are looked at
+    """
+
+    def __init__(self, cachefile):
+        """
+        Maps the cache file and checks its header
+        :param cachefile: name of the cache file
+        """
+
+        with open(cachefile, 'rb') as reader:
+            self.mapped = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Check the header and section sizes before handing out any views
+        try:
+            if len(self.mapped) < HEADER.size:
+                raise ValueError('truncated roster cache')
+            (magic, version, self.source_size, self.source_mtime, n) = HEADER.unpack_from(self.mapped)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError('not a roster cache')
+            if len(self.mapped) < HEADER.size + 8 * (3 * n + 1) + 8 * n:
+                raise ValueError('truncated roster cache')
+        except ValueError:
+            self.mapped.close()
+            raise
+
+        # Zero-copy views of each section of the file
+        view = memoryview(self.mapped)
+        start = HEADER.size
+        end = start + 8 * (3 * n + 1)
+        self.offsets = view[start:end].cast('Q')
+        start = end
+        end = start + 4 * n
+        self.by_first = view[start:end].cast('I')
+        start = end
+        end = start + 4 * n
+        self.by_last = view[start:end].cast('I')
+        self.text = view[end:]
+        view.release()
+
+        self.size = n
+
+        # The text must end exactly where the last offset says it does
+        if len(self.text) != self.offsets[-1]:
+            self.close()
+            raise ValueError('truncated roster cache')
+
+    def __len__(self):
+        """
+        Computes the number of people in the roster
+        :return: The size of the roster
+        """
+
+        return self.size
+
+    def __getitem__(self, i):
+        """
+        Decodes one person of the roster, in file order
+        :param i: the person's position
+        :return: a Person
+        """
+
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+
+        fields = [str(self.text[self.offsets[j]:self.offsets[j + 1]], 'utf-8')
+                  for j in range(3 * i, 3 * i + 3)]
+        return Person(*fields)
+
+    def __iter__(self):
+        """
+        Iterates over the roster in file order
+        :return: An iterator
+        """
+
+        for i in range(self.size):
+            yield self[i]
+
+    def ordered(self, ordering):
+        """
+        Iterates over the roster in a precomputed ordering
+        :param ordering: order_first_name or order_last_name
+        :return: An iterator
+        """
+
+        if ordering is order_first_name:
+            positions = self.by_first
+        elif ordering is order_last_name:
+            positions = self.by_last
+        else:
+            raise ValueError('no cached order for {0}'.format(ordering))
+
+        for i in positions:
+            yield self[i]
+
+    def close(self):
+        """
+        Unmaps the cache file
+        """
+
+        for view in (self.offsets, self.by_first, self.by_last, self.text):
+            view.release()
+        self.mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,140 @@
+""" This module creates a RosterIndex class that answers lookups on a loaded
+    roster without scanning it.
+    People are found by email through a hash index, and by the start of
+    their first or last name through sorted name indexes and binary search.
+"""
+
+import bisect
+
+from alphabetizer import alphabetize_by_key, first_name_key, last_name_key
+
+
+class RosterIndex:
+    """
+    Email and name prefix indexes over a roster
+    """
+
+    def __init__(self, roster=()):
+        """
+        Builds the indexes
+        :param roster: people to index
+        """
+
+        self.roster = list(roster)
+
+        # People whose email was already taken by an earlier person
+        self.duplicates = []
+
+        self.by_email = {}
+        for person in self.roster:
+            self._add_email(person)
+
+        # Parallel lists of sort keys and people, sorted by key
+        self.first_keys = []
+        self.first_people = []
+        self.last_keys = []
+        self.last_people = []
+        self._build_names()
+
+    def __len__(self):
+        """
+        Computes the number of people indexed
+        :return: The size of the roster
+        """
+
+        return len(self.roster)
+
+    def add(self, person):
+        """
+        Adds a person to the roster and to every index
+        :param person: a Person
+        """
+
+        self.roster.append(person)
+        self._add_email(person)
+        _insert(self.first_keys, self.first_people, first_name_key(person), person)
+        _insert(self.last_keys, self.last_people, last_name_key(person), person)
+
+    def find_email(self, email):
+        """
+        Finds a person by email in O(1)
+        :param email: an email address
+        :return: the first person loaded with that email, or None
+        """
+
+        return self.by_email.get(email)
+
+    def first_name_prefix(self, prefix):
+        """
+        Finds everybody whose first name starts with prefix in O(log n + k)
+        :param prefix: the start of a first name
+        :return: a list of people ordered by first name, then last name
+        """
+
+        return _prefix_search(self.first_keys, self.first_people, prefix)
+
+    def last_name_prefix(self, prefix):
+        """
+        Finds everybody whose last name starts with prefix in O(log n + k)
+        :param prefix: the start of a last name
+        :return: a list of people ordered by last name, then first name
+        """
+
+        return _prefix_search(self.last_keys, self.last_people, prefix)
+
+    # Helper functions
+
+    def _add_email(self, person):
+        """
+        Adds a person to the email index, remembering them if the email is taken
+        :param person: a Person
+        """
+
+        if person.email in self.by_email:
+            self.duplicates.append(person)
+        else:
+            self.by_email[person.email] = person
+
+    def _build_names(self):
+        """
+        Sorts the roster once into the first name and last name indexes
+        """
+
+        (self.first_people, cost) = alphabetize_by_key(self.roster, first_name_key)
+        self.first_keys = [first_name_key(person) for person in self.first_people]
+
+        (self.last_people, cost) = alphabetize_by_key(self.roster, last_name_key)
+        self.last_keys = [last_name_key(person) for person in self.last_people]
+
+
+def _insert(keys, people, key, person):
+    """
+    Inserts a person into a sorted name index, after anyone with the same key
+    :param keys: sorted list of keys
+    :param people: list of people parallel to keys
+    :param key: the person's key
+    :param person: a Person
+    """
+
+    i = bisect.bisect_right(keys, key)
+    keys.insert(i, key)
+    people.insert(i, person)
+
+
+def _prefix_search(keys, people, prefix):
+    """
+    Collects the people whose leading name starts with prefix
+    :param keys: sorted list of (name, other name) keys
+    :param people: list of people parallel to keys
+    :param prefix: the start of a name
+    :return: a list of the matching people in index order
+    """
+
+    # (prefix,) sorts before every key whose name starts with prefix
+    i = bisect.bisect_left(keys, (prefix,))
+
+    matches = []
+    while i < len(keys) and keys[i][0].startswith(prefix):
+        matches.append(people[i])
+        i += 1
+    return matches
@@ -0,0 +1,295 @@
+""" This module creates a SortedRoster class that keeps a roster alphabetized
+    as people are added and removed, instead of re-sorting the whole roster.
+    The roster is backed by an AVL tree ordered by one of the orderings in
+    alphabetizer.py. People that tie under the ordering share a node.
+"""
+
+
+class SortedRoster:
+    """
+    A roster of people that is always alphabetized by an ordering
+    """
+
+    def __init__(self, ordering, roster=()):
+        """
+        Initializes the roster
+        :param ordering: a function comparing two elements
+        :param roster: people to start the roster with
+        """
+
+        self.ordering = ordering
+        self.root = None
+        self.size = 0
+
+        for person in roster:
+            self.insert(person)
+
+    def __len__(self):
+        """
+        Counts the number of people in the roster
+        :return: The size of the roster
+        """
+
+        return self.size
+
+    def insert(self, person):
+        """
+        Adds a person to the roster in O(log n)
+        People who tie under the ordering keep their insertion order
+        :param person: a Person
+        """
+
+        self.root = self._insert(self.root, person)
+        self.size += 1
+
+    def remove(self, person):
+        """
+        Removes a person from the roster in O(log n)
+        :param person: a Person
+        :return: True if the person was in the roster and False otherwise
+        """
+
+        (self.root, removed) = self._remove(self.root, person)
+        if removed:
+            self.size -= 1
+        return removed
+
+    def lookup(self, probe):
+        """
+        Finds everybody who ties with probe under the ordering in O(log n)
+        :param probe: a Person, possibly with only the ordered fields filled in
+        :return: a list of the matching people in insertion order
+        """
+
+        node = self._find(probe)
+        if node is None:
+            return []
+        return list(node.people)
+
+    def __contains__(self, person):
+        """
+        Checks if the person is in the roster
+        :param person: a Person
+        :return: True if the person is in the roster and False otherwise
+        """
+
+        node = self._find(person)
+        return node is not None and person in node.people
+
+    def __iter__(self):
+        """
+        Iterates over the roster in alphabetical order
+        :return: An iterator
+        """
+
+        # Iterative in-order traversal so deep trees do not recurse
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield from node.people
+            node = node.right
+
+    def is_empty(self):
+        """
+        Checks if the roster is empty
+        :return: True if the roster contains no people, False otherwise
+        """
+        return len(self) == 0
+
+    def __repr__(self):
+        """
+        A string representation of this roster
+        :return: A string
+        """
+        return 'SortedRoster([{0}])'.format(','.join(repr(person) for person in self))
+
+    # Helper functions
+
+    def _find(self, probe):
+        """
+        Finds the node whose people tie with probe
+        :param probe: a Person
+        :return: the node, or None if there is no such node
+        """
+
+        node = self.root
+        while node is not None:
+            if self.ordering(probe, node.people[0]):
+                node = node.left
+            elif self.ordering(node.people[0], probe):
+                node = node.right
+            else:
+                return node
+        return None
+
+    def _insert(self, node, person):
+        """
+        Recursively inserts a person below node
+        :param node: root of a subtree
+        :param person: a Person
+        :return: the new root of the subtree
+        """
+
+        if node is None:
+            return RosterNode(person)
+
+        if self.ordering(person, node.people[0]):
+            node.left = self._insert(node.left, person)
+        elif self.ordering(node.people[0], person):
+            node.right = self._insert(node.right, person)
+        else:
+            node.people.append(person)
+            return node
+
+        return node.rebalance()
+
+    def _remove(self, node, person):
+        """
+        Recursively removes a person from below node
+        :param node: root of a subtree
+        :param person: a Person
+        :return: the new root of the subtree
+        :return: True if the person was removed and False otherwise
+        """
+
+        if node is None:
+            return (None, False)
+
+        if self.ordering(person, node.people[0]):
+            (node.left, removed) = self._remove(node.left, person)
+        elif self.ordering(node.people[0], person):
+            (node.right, removed) = self._remove(node.right, person)
+        else:
+            if person not in node.people:
+                return (node, False)
+            node.people.remove(person)
+            if node.people:
+                return (node, True)
+
+            # The node is empty, so splice it out of the tree
+            if node.left is None:
+                return (node.right, True)
+            if node.right is None:
+                return (node.left, True)
+            (node.right, successor) = node.right.pop_min()
+            node.people = successor.people
+            removed = True
+
+        return (node.rebalance(), removed)
+
+
+class RosterNode:
+    """
+    An AVL tree node to be used by the SortedRoster
+    """
+
+    __slots__ = ('people', 'left', 'right', 'height')
+
+    def __init__(self, person):
+        """
+        Constructor
+        :param person: the first person stored in this node
+        """
+
+        self.people = [person]
+        self.left = None
+        self.right = None
+        self.height = 0
+
+    def __repr__(self):
+        """
+        A string representing this node
+        :return: A string
+        """
+        return 'RosterNode({0})'.format(self.people)
+
+    def balance(self):
+        """
+        Computes how much taller the left subtree is than the right one
+        :return: the balance factor
+        """
+
+        return _height(self.left) - _height(self.right)
+
+    def update_height(self):
+        """
+        Recomputes the height of this node from its children
+        """
+
+        self.height = 1 + max(_height(self.left), _height(self.right))
+
+    def rotate_left(self):
+        """
+        Rotates this subtree to the left
+        :return: the new root of the subtree
+        """
+
+        root = self.right
+        self.right = root.left
+        root.left = self
+        self.update_height()
+        root.update_height()
+        return root
+
+    def rotate_right(self):
+        """
+        Rotates this subtree to the right
+        :return: the new root of the subtree
+        """
+
+        root = self.left
+        self.left = root.right
+        root.right = self
+        self.update_height()
+        root.update_height()
+        return root
+
+    def rebalance(self):
+        """
+        Restores the AVL property at this node
+        If tree is left heavy, do right rotation
+        If tree is right heavy, do left rotation
+        :return: the new root of the subtree
+        """
+
+        self.update_height()
+        balance = self.balance()
+
+        if balance > 1:
+            if self.left.balance() < 0:
+                self.left = self.left.rotate_left()
+            return self.rotate_right()
+
+        if balance < -1:
+            if self.right.balance() > 0:
+                self.right = self.right.rotate_right()
+            return self.rotate_left()
+
+        return self
+
+    def pop_min(self):
+        """
+        Detaches the leftmost node of this subtree
+        :return: the new root of the subtree
+        :return: the detached node
+        """
+
+        if self.left is None:
+            return (self.right, self)
+
+        (self.left, smallest) = self.left.pop_min()
+        return (self.rebalance(), smallest)
+
+
+def _height(node):
+    """
+    Gets the height of a possibly empty subtree
+    :param node: a RosterNode or None
+    :return: the height of the subtree
+    """
+
+    return -1 if node is None else node.height
@@ -1,8 +1,14 @@
 #!/usr/bin/python3
+import os
+import tempfile
 import unittest
 
-from main import Person, load_file
+from main import Person, load_file, load_columnar, load_indexed, stream_file, write_file, external_alphabetize, \
+    cached_roster, merge_files
 from alphabetizer import *
+from sortedroster import SortedRoster
+from rostercache import load_cache
+from benchmark import generate_roster
 
 class TestAlphabetizer(unittest.TestCase):
 
@@ -51,6 +57,228 @@ class TestAlphabetizer(unittest.TestCase):
     #     (sorted_list, cost) = alphabetize(member_list, order_last_name)
     #     self.assertEqual(sorted_list, solution)
 
+    def test_external_alphabetize(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            outfile = os.path.join(out_dir, 'sorted.txt')
+            cost = external_alphabetize('gryffindor.txt', outfile, order_first_name, run_size=7)
+            self.assertEqual(load_file(outfile), load_file('sorted_first_name.txt'))
+            self.assertGreater(cost, 0)
+            external_alphabetize('gryffindor.txt', outfile, order_last_name, run_size=7)
+            self.assertEqual(load_file(outfile), load_file('sorted_last_name.txt'))
+
+    def test_alphabetize_by_key(self):
+        for (ordering, key) in ((order_first_name, first_name_key), (order_last_name, last_name_key)):
+            (expected, expected_cost) = alphabetize(load_file('gryffindor.txt'), ordering)
+            (sorted_list, cost) = alphabetize_by_key(load_file('gryffindor.txt'), key, count=True)
+            self.assertEqual(sorted_list, expected)
+            self.assertEqual(cost, expected_cost)
+            self.assertEqual(alphabetize_by_key(load_file('gryffindor.txt'), key), (expected, None))
+
+    def test_alphabetize_bottom_up(self):
+        member_list = load_file('gryffindor.txt')
+        (sorted_list, cost) = alphabetize_bottom_up(member_list, order_last_name)
+        self.assertEqual(sorted_list, load_file('sorted_last_name.txt'))
+        self.assertEqual(alphabetize_bottom_up([], order_last_name), ([], 0))
+        data = [5, 3, 2, 6, 4, 9, 7, 1, 8]
+        self.assertEqual(alphabetize_bottom_up(data, lambda a, b: a < b)[0], sorted(data))
+
+    def test_alphabetize_adaptive(self):
+        member_list = load_file('gryffindor.txt')
+        (sorted_list, cost) = alphabetize_adaptive(member_list, order_first_name)
+        self.assertEqual(sorted_list, load_file('sorted_first_name.txt'))
+
+        # A sorted roster with a few additions should cost close to n comparisons
+        member_list = load_file('sorted_first_name.txt')
+        additions = [Person('Zacharias', 'Smith', 'zsmith@hogwarts.edu'),
+                     Person('Cedric', 'Diggory', 'cdiggory@hogwarts.edu')]
+        (sorted_list, cost) = alphabetize_adaptive(member_list + additions, order_first_name)
+        self.assertTrue(is_alphabetized(sorted_list, order_first_name))
+        self.assertEqual(len(sorted_list), len(member_list) + 2)
+        self.assertLess(cost, 2 * len(sorted_list))
+
+    def test_parallel_alphabetize(self):
+        member_list = load_file('gryffindor.txt')
+        (sorted_list, cost) = parallel_alphabetize(member_list, order_last_name, processes=3)
+        self.assertEqual(sorted_list, load_file('sorted_last_name.txt'))
+        self.assertIsNone(cost)
+        (sorted_list, cost) = parallel_alphabetize(member_list, order_last_name, processes=3, count=True)
+        self.assertEqual(sorted_list, load_file('sorted_last_name.txt'))
+        self.assertGreater(cost, 0)
+
+        # Other orderings rebuild people from their fields in the workers
+        (expected, expected_cost) = alphabetize(member_list, order_first_name_collated)
+        (sorted_list, cost) = parallel_alphabetize(member_list, order_first_name_collated, processes=3)
+        self.assertEqual(sorted_list, expected)
+        self.assertGreater(cost, 0)
+
+    def test_sorted_roster(self):
+        roster = SortedRoster(order_first_name, load_file('gryffindor.txt'))
+        self.assertEqual(list(roster), load_file('sorted_first_name.txt'))
+        self.assertEqual(50, len(roster))
+
+        harry = Person('Harry', 'Potter', 'hpotter@hogwarts.edu')
+        self.assertTrue(harry in roster)
+        self.assertEqual([harry], roster.lookup(Person('Harry', 'Potter', '')))
+        self.assertTrue(roster.remove(harry))
+        self.assertFalse(roster.remove(harry))
+        self.assertFalse(harry in roster)
+        roster.insert(harry)
+        self.assertEqual(list(roster), load_file('sorted_first_name.txt'))
+
+    def test_alphabetize_columnar(self):
+        member_list = load_columnar('gryffindor.txt')
+        self.assertEqual(list(member_list), load_file('gryffindor.txt'))
+        (sorted_list, cost) = alphabetize_columnar(member_list, order_first_name)
+        self.assertEqual(list(sorted_list), load_file('sorted_first_name.txt'))
+        self.assertIsNone(cost)
+        (sorted_list, cost) = alphabetize_columnar(member_list, order_first_name, count=True)
+        self.assertEqual(list(sorted_list), load_file('sorted_first_name.txt'))
+        self.assertGreater(cost, 0)
+        (sorted_list, cost) = alphabetize_columnar(member_list, order_last_name)
+        self.assertEqual(list(sorted_list), load_file('sorted_last_name.txt'))
+        (sorted_list, cost) = alphabetize_columnar(member_list, lambda a, b: order_last_name(a, b))
+        self.assertEqual(list(sorted_list), load_file('sorted_last_name.txt'))
+
+    def test_streaming_io(self):
+        member_list = load_file('gryffindor.txt')
+        self.assertEqual(list(stream_file('gryffindor.txt', use_mmap=True)), member_list)
+        self.assertEqual(list(stream_file('gryffindor.txt', buffer_size=64)), member_list)
+        with tempfile.TemporaryDirectory() as out_dir:
+            outfile = os.path.join(out_dir, 'out.txt')
+            write_file(outfile, iter(member_list), buffer_size=64)
+            self.assertEqual(load_file(outfile, use_mmap=True), member_list)
+            write_file(outfile, [])
+            self.assertEqual(list(stream_file(outfile, use_mmap=True)), [])
+
+    def test_collated_orderings(self):
+        zoe = Person('zoe', 'Lynd', 'zlynd@hogwarts.edu')
+        amelie = Person('Ame\u0301lie', 'lynd', 'alynd@hogwarts.edu')
+        anna = Person('Anna', 'Lynd', 'alynd2@hogwarts.edu')
+        self.assertFalse(order_first_name(zoe, anna))
+        self.assertTrue(order_first_name_collated(anna, zoe))
+        self.assertFalse(order_first_name_collated(Person('\u00c9lie', 'A', ''), amelie))
+        self.assertTrue(order_last_name_collated(amelie, zoe))
+
+        (sorted_list, cost) = alphabetize([zoe, amelie, anna], order_first_name_collated)
+        self.assertEqual(sorted_list, [amelie, anna, zoe])
+        self.assertTrue(is_alphabetized(sorted_list, order_first_name_collated))
+        (sorted_list, cost) = alphabetize_by_key([zoe, amelie, anna], last_name_collation_key)
+        self.assertEqual(sorted_list, [amelie, anna, zoe])
+
+        # Renaming somebody invalidates their cached key
+        zoe.first = 'Aaron'
+        self.assertTrue(order_first_name_collated(zoe, amelie))
+
+    def test_alphabetize_top(self):
+        solution = load_file('sorted_last_name.txt')
+        for k in (0, 1, 10, 50, 60):
+            (top, cost) = alphabetize_top(load_file('gryffindor.txt'), order_last_name, k)
+            self.assertEqual(top, solution[:k])
+        data = [(5, 'a'), (3, 'b'), (5, 'c'), (1, 'd'), (3, 'e')]
+        (top, cost) = alphabetize_top(data, lambda a, b: a[0] < b[0], 3)
+        self.assertEqual(top, [(1, 'd'), (3, 'b'), (3, 'e')])
+        self.assertGreater(cost, 0)
+
+    def test_roster_index(self):
+        index = load_indexed('gryffindor.txt')
+        self.assertEqual(50, len(index))
+        self.assertEqual([Person('Ginny', 'Weasley', 'gweasley@hogwarts.edu')], index.duplicates)
+        harry = Person('Harry', 'Potter', 'hpotter@hogwarts.edu')
+        self.assertEqual(harry, index.find_email('hpotter@hogwarts.edu'))
+        self.assertIsNone(index.find_email('voldemort@hogwarts.edu'))
+
+        weasleys = index.last_name_prefix('Weas')
+        self.assertTrue(len(weasleys) > 1)
+        self.assertTrue(all(person.last == 'Weasley' for person in weasleys))
+        self.assertTrue(is_alphabetized(weasleys, order_last_name))
+        self.assertEqual([], index.first_name_prefix('Zz'))
+        self.assertEqual(index.first_name_prefix(''), load_file('sorted_first_name.txt'))
+
+        index.add(Person('Harriet', 'Potter', 'hpotter@hogwarts.edu'))
+        self.assertEqual(2, len(index.duplicates))
+        self.assertEqual(harry, index.find_email('hpotter@hogwarts.edu'))
+        self.assertEqual(['Harriet', 'Harry'], [person.first for person in index.first_name_prefix('Harr')])
+
+    def test_cached_roster(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            source = os.path.join(cache_dir, 'roster.txt')
+            cachefile = os.path.join(cache_dir, 'roster.cache')
+            write_file(source, load_file('gryffindor.txt'))
+
+            with cached_roster(source, cachefile) as roster:
+                self.assertEqual(list(roster), load_file('gryffindor.txt'))
+                self.assertEqual(list(roster.ordered(order_first_name)), load_file('sorted_first_name.txt'))
+                self.assertEqual(list(roster.ordered(order_last_name)), load_file('sorted_last_name.txt'))
+
+            # Changing the source invalidates the cache
+            write_file(source, load_file('short.txt')[:3])
+            with cached_roster(source, cachefile) as roster:
+                self.assertEqual(3, len(roster))
+                self.assertEqual(list(roster), load_file('short.txt')[:3])
+
+            # A truncated cache is rejected and rebuilt, even though the source is unchanged
+            with open(cachefile, 'r+b') as writer:
+                writer.truncate(os.path.getsize(cachefile) - 5)
+            self.assertIsNone(load_cache(cachefile, source))
+            with cached_roster(source, cachefile) as roster:
+                self.assertEqual(list(roster), load_file('short.txt')[:3])
+            self.assertEqual([], [name for name in os.listdir(cache_dir) if name.endswith('.tmp')])
+
+            # A missing source is an error, not a stale cache
+            os.remove(source)
+            self.assertRaises(FileNotFoundError, load_cache, cachefile, source)
+
+    def test_alphabetize_radix(self):
+        (sorted_list, cost) = alphabetize_radix(load_file('gryffindor.txt'), order_first_name)
+        self.assertEqual(sorted_list, load_file('sorted_first_name.txt'))
+        (sorted_list, cost) = alphabetize_radix(load_file('gryffindor.txt'), order_last_name)
+        self.assertEqual(sorted_list, load_file('sorted_last_name.txt'))
+        self.assertRaises(ValueError, alphabetize_radix, [], order_first_name_collated)
+
+    def test_engines(self):
+        for (name, engine) in ENGINES.items():
+            (sorted_list, cost) = engine(load_file('gryffindor.txt'), order_last_name)
+            self.assertEqual(sorted_list, load_file('sorted_last_name.txt'), name)
+
+    def test_merge_files(self):
+        member_list = load_file('gryffindor.txt')
+        with tempfile.TemporaryDirectory() as out_dir:
+            infiles = []
+            for i in range(4):
+                infile = os.path.join(out_dir, 'house{0}.txt'.format(i))
+                write_file(infile, member_list[i::4])
+                infiles.append(infile)
+            outfile = os.path.join(out_dir, 'merged.txt')
+            cost = merge_files(infiles, outfile, order_last_name, threads=2, processes=2)
+            self.assertEqual(load_file(outfile), load_file('sorted_last_name.txt'))
+            self.assertGreater(cost, 0)
+
+    def test_generate_roster(self):
+        roster = generate_roster(200, duplicate_rate=0.5, seed=7)
+        self.assertEqual(200, len(roster))
+        self.assertEqual(roster, generate_roster(200, duplicate_rate=0.5, seed=7))
+        self.assertLess(len(set(first_name_key(person) for person in roster)), 150)
+        self.assertTrue(is_alphabetized(generate_roster(200, presortedness=1.0), order_first_name))
+        self.assertTrue(is_alphabetized(generate_roster(200, presortedness=1.0, key=last_name_key), order_last_name))
+
+    def test_alphabetize_by_spec(self):
+        (sorted_list, cost) = alphabetize_by_spec(load_file('gryffindor.txt'), [('last', ASCENDING), ('first', ASCENDING)])
+        self.assertEqual(sorted_list, load_file('sorted_last_name.txt'))
+
+        (sorted_list, cost) = alphabetize_by_spec(load_file('gryffindor.txt'), [('last', DESCENDING), ('email', ASCENDING)])
+        self.assertEqual(sorted_list[0].last, 'Wood')
+        for (a, b) in zip(sorted_list, sorted_list[1:]):
+            self.assertTrue(a.last > b.last or (a.last == b.last and a.email <= b.email))
+
+        data = [Person('A', 'Smith', 'ab'), Person('B', 'Smith', 'abc'), Person('C', 'Smith', 'a')]
+        (sorted_list, cost) = alphabetize_by_spec(data, [('email', DESCENDING)])
+        self.assertEqual([person.email for person in sorted_list], ['abc', 'ab', 'a'])
+        data = [Person('Zoé', 'A', 'z'), Person('Zoe', 'B', 'y'), Person('Zoë', 'C', 'x')]
+        (sorted_list, cost) = alphabetize_by_spec(data, [('first', DESCENDING)])
+        self.assertEqual([person.first for person in sorted_list], ['Zoë', 'Zoé', 'Zoe'])
+        self.assertRaises(ValueError, sort_key, [('house', ASCENDING)])
+        self.assertRaises(ValueError, sort_key, [('last', 'up')])
+
     def number_test(self):
         data = [5, 3, 2, 6, 4, 9, 7, 1, 8]
         self.assertFalse(is_alphabetized(data, lambda a, b: a < b))
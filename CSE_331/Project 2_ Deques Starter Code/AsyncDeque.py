@@ -0,0 +1,114 @@
+""" Create an asyncio Deque whose pops wait for elements and whose pushes wait for room """
+
+######################
+# AsyncDeque.py
+######################
+
+# https://docs.python.org/3/library/asyncio-sync.html#condition
+
+import asyncio
+
+from Deque import Deque, RAISE
+
+
+class AsyncDeque:
+    """
+    A double-ended queue for coroutines on one event loop
+    Waiting coroutines are suspended on a condition and woken by the push or
+    pop that lets them continue, so nothing polls
+    """
+
+    def __init__(self, maxlen=None):
+        """
+        Initializes an empty AsyncDeque
+        :param maxlen: the most elements the deque may hold before pushes
+        wait for room, or None for no limit
+        """
+
+        self.deque = Deque(maxlen, RAISE)
+        lock = asyncio.Lock()
+        self.not_empty = asyncio.Condition(lock)
+        self.not_full = asyncio.Condition(lock)
+
+    def __len__(self):
+        """
+        Computes the number of elements in the deque
+        :return: The size of the deque
+        """
+
+        return len(self.deque)
+
+    def is_empty(self):
+        """
+        Checks if the deque is empty
+        :return: True if the deque contains no elements, False otherwise
+        """
+        return len(self) == 0
+
+    def is_full(self):
+        """
+        Checks if a bounded deque has reached its maxlen
+        :return: True if a push would have to wait, False otherwise
+        """
+        return self.deque.is_full()
+
+    async def push_front(self, e):
+        """
+        Inserts an element at the front of the deque, waiting for room if full
+        :param e: An element to insert
+        """
+
+        async with self.not_full:
+            await self.not_full.wait_for(lambda: not self.deque.is_full())
+            self.deque.push_front(e)
+            self.not_empty.notify()
+
+    async def push_back(self, e):
+        """
+        Inserts an element at the back of the deque, waiting for room if full
+        :param e: An element to insert
+        """
+
+        async with self.not_full:
+            await self.not_full.wait_for(lambda: not self.deque.is_full())
+            self.deque.push_back(e)
+            self.not_empty.notify()
+
+    async def pop_front(self):
+        """
+        Removes and returns the first element, waiting for one if empty
+        :return: The (former) first element
+        """
+
+        async with self.not_empty:
+            await self.not_empty.wait_for(lambda: not self.deque.is_empty())
+            e = self.deque.pop_front()
+            self.not_full.notify()
+            return e
+
+    async def pop_back(self):
+        """
+        Removes and returns the last element, waiting for one if empty
+        :return: The (former) last element
+        """
+
+        async with self.not_empty:
+            await self.not_empty.wait_for(lambda: not self.deque.is_empty())
+            e = self.deque.pop_back()
+            self.not_full.notify()
+            return e
+
+    def __iter__(self):
+        """
+        Iterates over the deque from front to back
+        :return: An iterator
+        """
+
+        return iter(self.deque)
+
+    def __repr__(self):
+        """
+        A string representation of this deque
+        :return: A string
+        """
+        return 'AsyncDeque([{0}])'.format(','.join(str(item) for item in self))
@@ -0,0 +1,294 @@
+""" Create a thread-safe Deque with blocking pops and a work-stealing pool """
+
+######################
+# ConcurrentDeque.py
+######################
+
+# https://docs.python.org/3/library/threading.html#condition-objects
+# https://en.wikipedia.org/wiki/Work_stealing
+
+import itertools
+import threading
+import time
+
+from Deque import Deque, RAISE
+
+# Overflow policy that makes a push onto a full ConcurrentDeque wait for room
+BLOCK = 'block'
+
+# Seconds an idle worker waits on its own deque before trying to steal again
+IDLE_WAIT = 0.005
+
+
+class ConcurrentDeque:
+    """
+    A double-ended queue that can be shared between threads
+    Each ConcurrentDeque has its own lock, held only for the O(1) ring buffer
+    operation itself, so a pool of them does not contend on one global lock
+    """
+
+    def __init__(self, maxlen=None, overflow=BLOCK):
+        """
+        Initializes an empty ConcurrentDeque
+        :param maxlen: the most elements the deque may hold, or None for no limit
+        :param overflow: BLOCK, or one of the Deque overflow policies
+        """
+
+        self.overflow = overflow
+        self.deque = Deque(maxlen, RAISE if overflow == BLOCK else overflow)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __len__(self):
+        """
+        Computes the number of elements in the deque
+        :return: The size of the deque
+        """
+
+        with self.lock:
+            return len(self.deque)
+
+    def is_empty(self):
+        """
+        Checks if the deque is empty
+        :return: True if the deque contains no elements, False otherwise
+        """
+        return len(self) == 0
+
+    def push_front(self, e, timeout=None):
+        """
+        Inserts an element at the front of the deque
+        :param e: An element to insert
+        :param timeout: seconds to wait for room when full, None waits forever
+        """
+
+        with self.lock:
+            self._wait_for_room(timeout)
+            self.deque.push_front(e)
+            self.not_empty.notify()
+
+    def push_back(self, e, timeout=None):
+        """
+        Inserts an element at the back of the deque
+        :param e: An element to insert
+        :param timeout: seconds to wait for room when full, None waits forever
+        """
+
+        with self.lock:
+            self._wait_for_room(timeout)
+            self.deque.push_back(e)
+            self.not_empty.notify()
+
+    def pop_front(self, block=True, timeout=None):
+        """
+        Removes and returns the first element, waiting for one if needed
+        :param block: whether to wait when the deque is empty
+        :param timeout: seconds to wait, None waits forever
+        :return: The (former) first element
+        """
+
+        with self.lock:
+            self._wait_for_element(block, timeout)
+            e = self.deque.pop_front()
+            self.not_full.notify()
+            return e
+
+    def pop_back(self, block=True, timeout=None):
+        """
+        Removes and returns the last element, waiting for one if needed
+        :param block: whether to wait when the deque is empty
+        :param timeout: seconds to wait, None waits forever
+        :return: The (former) last element
+        """
+
+        with self.lock:
+            self._wait_for_element(block, timeout)
+            e = self.deque.pop_back()
+            self.not_full.notify()
+            return e
+
+    def steal(self):
+        """
+        Takes the oldest element without waiting, for use by a thief while
+        the owning thread pushes and pops at the back
+        :return: The (former) first element
+        """
+
+        return self.pop_front(block=False)
+
+    def __iter__(self):
+        """
+        Iterates over a snapshot of the deque from front to back
+        :return: An iterator
+        """
+
+        with self.lock:
+            return iter(list(self.deque))
+
+    def __repr__(self):
+        """
+        A string representation of this deque
+        :return: A string
+        """
+        return 'ConcurrentDeque([{0}])'.format(','.join(str(item) for item in self))
+
+    # Helper functions
+
+    def _wait_for_room(self, timeout):
+        """
+        Waits, with the lock held, until a BLOCK deque has room for a push
+        :param timeout: seconds to wait, None waits forever
+        """
+
+        if self.overflow == BLOCK and self.deque.maxlen is not None:
+            if not self.not_full.wait_for(lambda: not self.deque.is_full(), timeout):
+                raise OverflowError()
+
+    def _wait_for_element(self, block, timeout):
+        """
+        Waits, with the lock held, until the deque has an element to pop
+        :param block: whether to wait at all
+        :param timeout: seconds to wait, None waits forever
+        """
+
+        if not block or not self.not_empty.wait_for(lambda: not self.deque.is_empty(), timeout):
+            if self.deque.is_empty():
+                raise IndexError()
+
+
+class WorkStealingPool:
+    """
+    A pool of worker threads that each own a ConcurrentDeque of tasks
+    Owners push and pop at the back of their own deque, so recently spawned
+    tasks run first, and idle workers steal the oldest tasks from the front
+    of the other workers' deques
+    A task that raises does not stop its worker: the exception is kept in
+    errors and the worker moves on to the next task
+    """
+
+    def __init__(self, workers):
+        """
+        Starts the worker threads
+        :param workers: the number of worker threads
+        """
+
+        self.queues = [ConcurrentDeque() for i in range(workers)]
+        self.next_queue = itertools.cycle(range(workers))
+        self.local = threading.local()
+        self.pending = 0
+        self.idle = threading.Condition()
+        self.errors = []
+        self.closed = False
+
+        self.threads = [threading.Thread(target=self._work, args=(i,), daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, task):
+        """
+        Schedules a task, on the calling worker's own deque if called from a task
+        :param task: a function taking no arguments
+        """
+
+        with self.idle:
+            self.pending += 1
+            index = getattr(self.local, 'index', None)
+            if index is None:
+                index = next(self.next_queue)
+        self.queues[index].push_back(task)
+
+    def join(self):
+        """
+        Waits until every submitted task has run
+        """
+
+        with self.idle:
+            self.idle.wait_for(lambda: self.pending == 0)
+
+    def shutdown(self):
+        """
+        Waits for the submitted tasks, then stops the worker threads
+        """
+
+        self.join()
+        self.closed = True
+        for thread in self.threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    # Helper functions
+
+    def _work(self, index):
+        """
+        Runs tasks from this worker's deque, stealing when it runs dry
+        :param index: which deque this worker owns
+        """
+
+        self.local.index = index
+        own = self.queues[index]
+        while not self.closed:
+            try:
+                task = own.pop_back(timeout=IDLE_WAIT)
+            except IndexError:
+                task = self._steal(index)
+                if task is None:
+                    continue
+
+            try:
+                task()
+            except Exception as error:
+                with self.idle:
+                    self.errors.append(error)
+            finally:
+                with self.idle:
+                    self.pending -= 1
+                    if self.pending == 0:
+                        self.idle.notify_all()
+
+    def _steal(self, index):
+        """
+        Tries to take the oldest task from each other worker in turn
+        :param index: the thief's own deque
+        :return: a task, or None if every deque was empty
+        """
+
+        for i in range(1, len(self.queues)):
+            try:
+                return self.queues[(index + i) % len(self.queues)].steal()
+            except IndexError:
+                pass
+        return None
+
+
+def benchmark(worker_counts=(1, 2, 4, 8), tasks=2000, task_seconds=0.001):
+    """
+    Measures pool throughput for each number of workers
+    Tasks sleep to stand in for I/O, which releases the GIL the way real
+    blocking work does; pure Python CPU work will not scale across threads
+    :param worker_counts: pool sizes to try
+    :param tasks: the number of tasks run per pool size
+    :param task_seconds: how long each task sleeps
+    :return: a list of (workers, tasks per second) pairs
+    """
+
+    results = []
+    for workers in worker_counts:
+        with WorkStealingPool(workers) as pool:
+            start = time.perf_counter()
+            for i in range(tasks):
+                pool.submit(lambda: time.sleep(task_seconds))
+            pool.join()
+            results.append((workers, tasks / (time.perf_counter() - start)))
+    return results
+
+
+if __name__ == '__main__':
+    for (workers, throughput) in benchmark():
+        print('{0:>3} workers: {1:10.1f} tasks/s'.format(workers, throughput))
@@ -5,19 +5,44 @@
 ######################
 
 # http://interactivepython.org/courselib/static/pythonds/BasicDS/ImplementingaDequeinPython.html#lst-dequecode
+# https://en.wikipedia.org/wiki/Circular_buffer
+
+# Smallest number of slots the ring buffer shrinks down to
+MIN_CAPACITY = 8
+
+# Number of slots in each block of a BlockDeque
+BLOCK_SIZE = 64
+
+# What a push onto a full bounded Deque does
+DROP_OLDEST = 'drop_oldest'  # evict from the opposite end to make room
+DROP_NEWEST = 'drop_newest'  # discard the element being pushed
+RAISE = 'raise'              # raise an OverflowError
 
 
 class Deque:
     """
     A double-ended queue
+    Elements live in a circular buffer: the first element is at index head,
+    and the rest follow it, wrapping around to the start of the buffer
     """
 
-    def __init__(self):
+    def __init__(self, maxlen=None, overflow=DROP_OLDEST):
         """
         Initializes an empty Deque
+        :param maxlen: the most elements the Deque may hold, or None for no limit.
+        A bounded Deque allocates its whole buffer up front and never resizes it
+        :param overflow: DROP_OLDEST, DROP_NEWEST or RAISE, what a push onto
+        a full Deque does
         """
 
-        self.items = []
+        if maxlen is not None and maxlen < 0:
+            raise ValueError('maxlen must be non-negative')
+        if overflow not in (DROP_OLDEST, DROP_NEWEST, RAISE):
+            raise ValueError('unknown overflow policy {0!r}'.format(overflow))
+
+        self.maxlen = maxlen
+        self.overflow = overflow
+        self.clear()
 
     def __len__(self):
         """
@@ -25,7 +50,17 @@ class Deque:
         :return: The size of the Deque
         """
 
-        return len(self.items)
+        return self.size
+
+    @property
+    def items(self):
+        """
+        A read-only view of all the elements, from front to back
+        Nothing is copied, and writes must go through the Deque itself
+        :return: A DequeView
+        """
+
+        return self.view(0, len(self))
 
     def peek_front(self):
         """
@@ -37,7 +72,7 @@ class Deque:
         if self.is_empty():
             raise IndexError()
 
-        return self.items[0]
+        return self.data[self.head]
 
     def peek_back(self):
         """
@@ -49,7 +84,7 @@ class Deque:
         if self.is_empty():
             raise IndexError()
 
-        return self.items[-1]
+        return self.data[(self.head + self.size - 1) % len(self.data)]
 
     def push_front(self, e):
         """
@@ -57,7 +92,21 @@ class Deque:
         :param e: An element to insert
         """
 
-        self.items.insert(0, e)
+        if self.size == self.maxlen:
+            if self.overflow == RAISE:
+                raise OverflowError()
+            if self.overflow == DROP_OLDEST and self.size:
+                # The buffer is exactly full, so the slot before head is the back
+                self.head = (self.head - 1) % len(self.data)
+                self.data[self.head] = e
+            return
+
+        if self.size == len(self.data):
+            self._resize(2 * len(self.data))
+
+        self.head = (self.head - 1) % len(self.data)
+        self.data[self.head] = e
+        self.size += 1
 
     def push_back(self, e):
         """
@@ -65,7 +114,20 @@ class Deque:
         :param e: An element to insert
         """
 
-        self.items.append(e)
+        if self.size == self.maxlen:
+            if self.overflow == RAISE:
+                raise OverflowError()
+            if self.overflow == DROP_OLDEST and self.size:
+                # The buffer is exactly full, so the slot after the back is head
+                self.data[self.head] = e
+                self.head = (self.head + 1) % len(self.data)
+            return
+
+        if self.size == len(self.data):
+            self._resize(2 * len(self.data))
+
+        self.data[(self.head + self.size) % len(self.data)] = e
+        self.size += 1
 
     def pop_front(self):
         """
@@ -77,7 +139,12 @@ class Deque:
         if self.is_empty():
             raise IndexError()
 
-        return self.items.pop(0)
+        e = self.data[self.head]
+        self.data[self.head] = None
+        self.head = (self.head + 1) % len(self.data)
+        self.size -= 1
+        self._shrink()
+        return e
 
     def pop_back(self):
         """
@@ -89,14 +156,32 @@ class Deque:
         if self.is_empty():
             raise IndexError()
 
-        return self.items.pop()
+        tail = (self.head + self.size - 1) % len(self.data)
+        e = self.data[tail]
+        self.data[tail] = None
+        self.size -= 1
+        self._shrink()
+        return e
 
     def clear(self):
         """
         Removes all elements from the Deque
         """
 
-        self.items = []
+        if self.maxlen is None:
+            self.data = [None] * MIN_CAPACITY
+        else:
+            self.data = [None] * max(self.maxlen, 1)
+        self.head = 0
+        self.size = 0
+
+    def is_full(self):
+        """
+        Checks if a bounded Deque has reached its maxlen
+        :return: True if another push would overflow, False otherwise
+        """
+
+        return self.size == self.maxlen
 
     def __iter__(self):
         """
@@ -105,8 +190,48 @@ class Deque:
         """
 
         # Yield returns the value of e
-        for e in self.items:
-            yield e
+        for i in range(self.size):
+            yield self.data[(self.head + i) % len(self.data)]
+
+    def __reversed__(self):
+        """
+        Iterates over this Deque from back to front
+        :return: An iterator
+        """
+
+        for i in reversed(range(self.size)):
+            yield self.data[(self.head + i) % len(self.data)]
+
+    def __getitem__(self, i):
+        """
+        Looks at the element at a position in O(1)
+        :param i: a position, negative positions count from the back,
+        or a slice with no step, which gives a DequeView
+        :return: The element, or a DequeView of the elements
+        """
+
+        if isinstance(i, slice):
+            return self.view(*_slice_range(i, self.size))
+
+        return self.data[self._slot(self._position(i))]
+
+    def __setitem__(self, i, e):
+        """
+        Replaces the element at a position in O(1)
+        :param i: a position, negative positions count from the back
+        :param e: the new element
+        """
+
+        self.data[self._slot(self._position(i))] = e
+
+    def __delitem__(self, i):
+        """
+        Removes the element at a position, moving the smaller side of the Deque
+        :param i: a position, negative positions count from the back
+        """
+
+        i = self._position(i)
+        self.drop_between(i, i + 1)
 
     def extend(self, other):
         """
@@ -114,7 +239,8 @@ class Deque:
         :param other: A Deque object
         """
 
-        for e in other.items:
+        # Take a snapshot first, so extending a Deque with itself terminates
+        for e in list(other):
             self.push_back(e)
 
     def drop_between(self, start, end):
@@ -128,11 +254,111 @@ class Deque:
         if start < 0 or end > len(self) or start >= end:
             raise IndexError()
 
-        # Deletes elements in range start to end
-        i = start
-        while i != end:
-            del self.items[start]
-            i += 1
+        count = end - start
+
+        # Close the gap by moving whichever side of it is smaller
+        if start < self.size - end:
+            for i in reversed(range(start)):
+                self.data[self._slot(i + count)] = self.data[self._slot(i)]
+            for i in range(count):
+                self.data[self._slot(i)] = None
+            self.head = self._slot(count)
+        else:
+            for i in range(end, self.size):
+                self.data[self._slot(i - count)] = self.data[self._slot(i)]
+            for i in range(self.size - count, self.size):
+                self.data[self._slot(i)] = None
+        self.size -= count
+
+        self._shrink()
+
+    def insert_between(self, index, elements):
+        """
+        Inserts elements into the Deque so the first of them ends up at index
+        :param index: the position to insert at, from 0 to len(self)
+        :param elements: an iterable of elements to insert, in order
+        """
+
+        if index < 0 or index > len(self):
+            raise IndexError()
+
+        elements = list(elements)
+        count = len(elements)
+
+        if self.maxlen is not None and self.size + count > self.maxlen:
+            if self.overflow == RAISE:
+                raise OverflowError()
+            if self.overflow == DROP_NEWEST:
+                elements = elements[:self.maxlen - self.size]
+                count = len(elements)
+            else:
+                # Keep the last maxlen elements of the combined sequence
+                combined = list(self)
+                combined[index:index] = elements
+                combined = combined[len(combined) - self.maxlen:]
+                self.data = combined + [None] * (len(self.data) - len(combined))
+                self.head = 0
+                self.size = len(combined)
+                return
+
+        if self.size + count > len(self.data):
+            self._resize(max(2 * len(self.data), self.size + count))
+
+        # Open a gap by moving whichever side of index is smaller
+        if index < self.size - index:
+            head = (self.head - count) % len(self.data)
+            for i in range(index):
+                self.data[(head + i) % len(self.data)] = self.data[self._slot(i)]
+            self.head = head
+        else:
+            for i in reversed(range(index, self.size)):
+                self.data[self._slot(i + count)] = self.data[self._slot(i)]
+        self.size += count
+
+        for (i, e) in enumerate(elements):
+            self.data[self._slot(index + i)] = e
+
+    def rotate(self, k):
+        """
+        Rotates the Deque k steps to the right, moving the last k elements
+        to the front, or -k steps to the left if k is negative
+        :param k: the number of steps
+        """
+
+        if self.size == 0:
+            return
+        k %= self.size
+
+        # A full buffer has no gap to move elements across
+        if self.size == len(self.data):
+            self.head = (self.head - k) % len(self.data)
+            return
+
+        # Move whichever is fewer elements across the gap
+        if k <= self.size - k:
+            for n in range(k):
+                tail = self._slot(self.size - 1)
+                self.head = (self.head - 1) % len(self.data)
+                self.data[self.head] = self.data[tail]
+                self.data[tail] = None
+        else:
+            for n in range(self.size - k):
+                self.data[self._slot(self.size)] = self.data[self.head]
+                self.data[self.head] = None
+                self.head = (self.head + 1) % len(self.data)
+
+    def view(self, start, stop):
+        """
+        Makes a view of the elements in the range [start, stop) without copying them
+        :param start: indicates the first position of the range
+        :param stop: indicates the last position of the range(not included)
+        :return: A DequeView
+        """
+
+        if start < 0 or stop > len(self) or start > stop:
+            raise IndexError()
+
+        return DequeView(self, start, stop)
 
     def count_if(self, criteria):
         """
@@ -142,7 +368,7 @@ class Deque:
         """
 
         i = 0
-        for e in self.items:
+        for e in self:
             if criteria(e):
                 i += 1
         return i
@@ -162,3 +388,577 @@ class Deque:
         :return: A string
         """
         return 'Deque([{0}])'.format(','.join(str(item) for item in self))
+
+    # Helper functions
+
+    def _position(self, i):
+        """
+        Checks a position and converts a negative one to count from the front
+        :param i: a position, negative positions count from the back
+        :return: a position from 0 to len(self) - 1
+        """
+
+        if i < 0:
+            i += self.size
+        if i < 0 or i >= self.size:
+            raise IndexError()
+        return i
+
+    def _slot(self, i):
+        """
+        Finds where the element at position i lives in the buffer
+        :param i: a position in the Deque
+        :return: an index into data
+        """
+
+        return (self.head + i) % len(self.data)
+
+    def _iter_range(self, start, stop):
+        """
+        Iterates over the elements in the range [start, stop)
+        :return: An iterator
+        """
+
+        for i in range(start, stop):
+            yield self.data[self._slot(i)]
+
+    def _resize(self, capacity):
+        """
+        Moves the elements into a new buffer, unwrapped to start at index 0
+        :param capacity: the number of slots in the new buffer
+        """
+
+        data = [None] * capacity
+        for (i, e) in enumerate(self):
+            data[i] = e
+        self.data = data
+        self.head = 0
+
+    def _shrink(self):
+        """
+        Halves the buffer for as long as it is only a quarter full
+        """
+
+        # A bounded buffer keeps its preallocated size
+        if self.maxlen is not None:
+            return
+
+        capacity = len(self.data)
+        while capacity > MIN_CAPACITY and self.size <= capacity // 4:
+            capacity = max(MIN_CAPACITY, capacity // 2)
+        if capacity != len(self.data):
+            self._resize(capacity)
+
+
+
+class BlockDeque:
+    """
+    A double-ended queue made of fixed-size blocks chained together
+    Growing never copies existing elements, and blocks are released one by
+    one as the queue drains, so every operation is O(1) in the worst case
+    """
+
+    # https://github.com/python/cpython/blob/main/Modules/_collectionsmodule.c
+
+    def __init__(self):
+        """
+        Initializes an empty BlockDeque
+        """
+
+        self.clear()
+
+    def __len__(self):
+        """
+        Computes the number of elements in the BlockDeque
+        :return: The size of the BlockDeque
+        """
+
+        return self.size
+
+    def peek_front(self):
+        """
+        Looks at, but does not remove, the first element
+        :return: The first element
+        """
+
+        # If BlockDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        return self.first.data[self.head]
+
+    def peek_back(self):
+        """
+        Looks at, but does not remove, the last element
+        :return: The last element
+        """
+
+        # If BlockDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        return self.last.data[self.tail]
+
+    def push_front(self, e):
+        """
+        Inserts an element at the front of the BlockDeque
+        :param e: An element to insert
+        """
+
+        # Chain a new block in front once the first block is full
+        if self.head == 0:
+            block = Block()
+            block.next = self.first
+            self.first.prev = block
+            self.first = block
+            self.head = BLOCK_SIZE
+
+        self.head -= 1
+        self.first.data[self.head] = e
+        self.size += 1
+
+    def push_back(self, e):
+        """
+        Inserts an element at the back of the BlockDeque
+        :param e: An element to insert
+        """
+
+        # Chain a new block behind once the last block is full
+        if self.tail == BLOCK_SIZE - 1:
+            block = Block()
+            block.prev = self.last
+            self.last.next = block
+            self.last = block
+            self.tail = -1
+
+        self.tail += 1
+        self.last.data[self.tail] = e
+        self.size += 1
+
+    def pop_front(self):
+        """
+        Removes and returns the first element
+        :return: The (former) first element
+        """
+
+        # If BlockDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        e = self.first.data[self.head]
+        self.first.data[self.head] = None
+        self.head += 1
+        self.size -= 1
+
+        if self.size == 0:
+            self._recenter()
+        elif self.head == BLOCK_SIZE:
+            # Release the emptied block
+            self.first = self.first.next
+            self.first.prev = None
+            self.head = 0
+
+        return e
+
+    def pop_back(self):
+        """
+        Removes and returns the last element
+        :return: The (former) last element
+        """
+
+        # If BlockDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        e = self.last.data[self.tail]
+        self.last.data[self.tail] = None
+        self.tail -= 1
+        self.size -= 1
+
+        if self.size == 0:
+            self._recenter()
+        elif self.tail < 0:
+            # Release the emptied block
+            self.last = self.last.prev
+            self.last.next = None
+            self.tail = BLOCK_SIZE - 1
+
+        return e
+
+    def clear(self):
+        """
+        Removes all elements from the BlockDeque
+        """
+
+        self.first = self.last = Block()
+        self.size = 0
+        self._recenter()
+
+    def __iter__(self):
+        """
+        Iterates over this BlockDeque from front to back
+        :return: An iterator
+        """
+
+        block = self.first
+        i = self.head
+        for n in range(self.size):
+            yield block.data[i]
+            i += 1
+            if i == BLOCK_SIZE:
+                block = block.next
+                i = 0
+
+    def __reversed__(self):
+        """
+        Iterates over this BlockDeque from back to front
+        :return: An iterator
+        """
+
+        block = self.last
+        i = self.tail
+        for n in range(self.size):
+            yield block.data[i]
+            i -= 1
+            if i < 0:
+                block = block.prev
+                i = BLOCK_SIZE - 1
+
+    def __getitem__(self, i):
+        """
+        Looks at the element at a position in O(n / BLOCK_SIZE),
+        walking the blocks in from the nearer end
+        :param i: a position, negative positions count from the back,
+        or a slice with no step, which gives a DequeView
+        :return: The element, or a DequeView of the elements
+        """
+
+        if isinstance(i, slice):
+            return self.view(*_slice_range(i, self.size))
+
+        (block, offset) = self._locate(self._position(i))
+        return block.data[offset]
+
+    def __setitem__(self, i, e):
+        """
+        Replaces the element at a position in O(n / BLOCK_SIZE)
+        :param i: a position, negative positions count from the back
+        :param e: the new element
+        """
+
+        (block, offset) = self._locate(self._position(i))
+        block.data[offset] = e
+
+    def __delitem__(self, i):
+        """
+        Removes the element at a position, moving the smaller side of the BlockDeque
+        :param i: a position, negative positions count from the back
+        """
+
+        i = self._position(i)
+        self.drop_between(i, i + 1)
+
+    def extend(self, other):
+        """
+        Takes a deque and adds each of its elements to the back of self
+        :param other: A deque object
+        """
+
+        # Take a snapshot first, so extending a BlockDeque with itself terminates
+        for e in list(other):
+            self.push_back(e)
+
+    def drop_between(self, start, end):
+        """
+        Deletes elements from the BlockDeque that are within the range [start, end)
+        :param start: indicates the first position of the range
+        :param end: indicates the last position of the range(does not drop this element)
+        """
+
+        # Checks for invalid ranges
+        if start < 0 or end > len(self) or start >= end:
+            raise IndexError()
+
+        count = end - start
+
+        # Close the gap by moving whichever side of it is smaller, then
+        # release the slots left over at that end
+        if start < self.size - end:
+            moves = zip(range(start), self._slots_backward(start - 1), self._slots_backward(end - 1))
+            for (n, (src, i), (dst, j)) in moves:
+                dst.data[j] = src.data[i]
+            for n in range(count):
+                self.pop_front()
+        else:
+            moves = zip(range(self.size - end), self._slots_forward(end), self._slots_forward(start))
+            for (n, (src, i), (dst, j)) in moves:
+                dst.data[j] = src.data[i]
+            for n in range(count):
+                self.pop_back()
+
+    def insert_between(self, index, elements):
+        """
+        Inserts elements into the BlockDeque so the first of them ends up at index
+        :param index: the position to insert at, from 0 to len(self)
+        :param elements: an iterable of elements to insert, in order
+        """
+
+        if index < 0 or index > len(self):
+            raise IndexError()
+
+        elements = list(elements)
+        count = len(elements)
+
+        # Open a gap by growing the end nearer to index and shifting that side
+        if index < self.size - index:
+            for n in range(count):
+                self.push_front(None)
+            moves = zip(range(index), self._slots_forward(count), self._slots_forward(0))
+        else:
+            size = self.size
+            for n in range(count):
+                self.push_back(None)
+            moves = zip(range(size - index), self._slots_backward(size - 1),
+                        self._slots_backward(self.size - 1))
+        for (n, (src, i), (dst, j)) in moves:
+            dst.data[j] = src.data[i]
+
+        for (e, (block, i)) in zip(elements, self._slots_forward(index)):
+            block.data[i] = e
+
+    def rotate(self, k):
+        """
+        Rotates the BlockDeque k steps to the right, moving the last k
+        elements to the front, or -k steps to the left if k is negative
+        :param k: the number of steps
+        """
+
+        if self.size == 0:
+            return
+        k %= self.size
+
+        # Move whichever is fewer elements from one end to the other
+        if k <= self.size - k:
+            for n in range(k):
+                self.push_front(self.pop_back())
+        else:
+            for n in range(self.size - k):
+                self.push_back(self.pop_front())
+
+    def view(self, start, stop):
+        """
+        Makes a view of the elements in the range [start, stop) without copying them
+        :param start: indicates the first position of the range
+        :param stop: indicates the last position of the range(not included)
+        :return: A DequeView
+        """
+
+        if start < 0 or stop > len(self) or start > stop:
+            raise IndexError()
+
+        return DequeView(self, start, stop)
+
+    def count_if(self, criteria):
+        """
+        counts how many elements of the BlockDeque satisfy the criteria
+        :param criteria: a bool function that takes an element of the BlockDeque
+        and returns true if that element matches the criteria and false otherwise
+        """
+
+        i = 0
+        for e in self:
+            if criteria(e):
+                i += 1
+        return i
+
+    def is_empty(self):
+        """
+        Checks if the BlockDeque is empty
+        :return: True if the BlockDeque contains no elements, False otherwise
+        """
+        return len(self) == 0
+
+    def __repr__(self):
+        """
+        A string representation of this BlockDeque
+        :return: A string
+        """
+        return 'BlockDeque([{0}])'.format(','.join(str(item) for item in self))
+
+    # Helper functions
+
+    def _position(self, i):
+        """
+        Checks a position and converts a negative one to count from the front
+        :param i: a position, negative positions count from the back
+        :return: a position from 0 to len(self) - 1
+        """
+
+        if i < 0:
+            i += self.size
+        if i < 0 or i >= self.size:
+            raise IndexError()
+        return i
+
+    def _locate(self, i):
+        """
+        Finds the block and slot of position i, walking in from the nearer end
+        :param i: a position in the BlockDeque
+        :return: the block holding position i
+        :return: the slot of position i in that block
+        """
+
+        if i < self.size // 2:
+            block = self.first
+            offset = self.head + i
+            while offset >= BLOCK_SIZE:
+                block = block.next
+                offset -= BLOCK_SIZE
+        else:
+            block = self.last
+            offset = self.tail - (self.size - 1 - i)
+            while offset < 0:
+                block = block.prev
+                offset += BLOCK_SIZE
+        return (block, offset)
+
+    def _slots_forward(self, i):
+        """
+        Yields the (block, slot) of positions i, i + 1, ... for as long as asked
+        :param i: the first position
+        :return: An iterator
+        """
+
+        (block, offset) = self._locate(i)
+        while True:
+            yield (block, offset)
+            offset += 1
+            if offset == BLOCK_SIZE:
+                block = block.next
+                offset = 0
+
+    def _slots_backward(self, i):
+        """
+        Yields the (block, slot) of positions i, i - 1, ... for as long as asked
+        :param i: the first position
+        :return: An iterator
+        """
+
+        (block, offset) = self._locate(i)
+        while True:
+            yield (block, offset)
+            offset -= 1
+            if offset < 0:
+                block = block.prev
+                offset = BLOCK_SIZE - 1
+
+    def _iter_range(self, start, stop):
+        """
+        Iterates over the elements in the range [start, stop)
+        :return: An iterator
+        """
+
+        for (n, (block, i)) in zip(range(start, stop), self._slots_forward(start)):
+            yield block.data[i]
+
+    def _recenter(self):
+        """
+        Points head and tail at the middle of the only block of an empty
+        BlockDeque, leaving room to push at either end
+        """
+
+        self.head = BLOCK_SIZE // 2
+        self.tail = self.head - 1
+
+
+class Block:
+    """
+    A fixed-size chunk of a BlockDeque
+    """
+
+    __slots__ = ('data', 'prev', 'next')
+
+    def __init__(self):
+        """
+        Constructor
+        """
+
+        self.data = [None] * BLOCK_SIZE
+        self.prev = None
+        self.next = None
+
+
+class DequeView:
+    """
+    A read-only window onto a range of a Deque or BlockDeque
+    Nothing is copied, so the view shows the deque's current contents
+    at those positions, even after the deque changes
+    """
+
+    def __init__(self, deque, start, stop):
+        """
+        Constructor
+        :param deque: the deque to look into
+        :param start: the first position of the range
+        :param stop: the last position of the range(not included)
+        """
+
+        self.deque = deque
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        """
+        Computes the number of elements in the view
+        :return: The size of the view
+        """
+
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        """
+        Looks at one element of the view
+        :param i: a position in the view, negative positions count from the back
+        :return: The element
+        """
+
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError()
+
+        return self.deque[self.start + i]
+
+    def __iter__(self):
+        """
+        Iterates over the view from front to back
+        :return: An iterator
+        """
+
+        # If the deque has shrunk past the end of the view, raise an error
+        if self.stop > len(self.deque):
+            raise IndexError()
+
+        return self.deque._iter_range(self.start, self.stop)
+
+    def __repr__(self):
+        """
+        A string representation of this view
+        :return: A string
+        """
+        return 'DequeView([{0}])'.format(','.join(str(item) for item in self))
+
+
+def _slice_range(s, size):
+    """
+    Converts a slice of a deque to the range it covers
+    :param s: a slice with no step
+    :param size: the length of the deque
+    :return: the first position of the range
+    :return: the last position of the range(not included)
+    """
+
+    (start, stop, step) = s.indices(size)
+    if step != 1:
+        raise ValueError('deque slices cannot have a step')
+    return (start, max(start, stop))
@@ -0,0 +1,350 @@
+#!/usr/bin/python3
+
+import asyncio
+import unittest
+import itertools
+import threading
+
+from Deque import Deque, BlockDeque, MIN_CAPACITY, BLOCK_SIZE, DROP_OLDEST, DROP_NEWEST, RAISE
+from ConcurrentDeque import ConcurrentDeque, WorkStealingPool
+from AsyncDeque import AsyncDeque
+from TypedDeque import TypedDeque, numpy
+
+
+def _wrapped_typed_deque():
+    """
+    Builds the TypedDeque -5..5 with its elements wrapped around the end of the buffer
+    :return: A TypedDeque
+    """
+
+    deque = TypedDeque('q')
+    for i in range(6):
+        deque.push_back(i)
+    for i in range(6):
+        deque.pop_front()
+    for i in range(6):
+        deque.push_back(i)
+        deque.push_front(-i)
+    return deque
+
+
+class DequeTests(unittest.TestCase):
+
+    def test_push_pop(self):
+        deque = Deque()
+        self.assertRaises(IndexError, deque.pop_front)
+        self.assertRaises(IndexError, deque.peek_back)
+        for i in range(100):
+            deque.push_back(i)
+            deque.push_front(-i)
+        self.assertEqual(200, len(deque))
+        self.assertEqual(-99, deque.peek_front())
+        self.assertEqual(99, deque.peek_back())
+        for i in reversed(range(100)):
+            self.assertEqual(-i, deque.pop_front())
+            self.assertEqual(i, deque.pop_back())
+        self.assertTrue(deque.is_empty())
+
+        # items is a read-only view, so writes through it fail instead of being lost
+        for i in range(5):
+            deque.push_back(i)
+        items = deque.items
+        self.assertEqual(list(range(5)), list(items))
+        self.assertEqual(4, items[-1])
+        with self.assertRaises(TypeError):
+            items[0] = 'x'
+        self.assertRaises(AttributeError, getattr, items, 'append')
+
+    def test_fifo_wraps_around(self):
+        deque = Deque()
+        pushed = itertools.count()
+        popped = itertools.count()
+        for i in range(1000):
+            deque.push_back(next(pushed))
+            deque.push_back(next(pushed))
+            self.assertEqual(next(popped), deque.pop_front())
+        for (i, j) in itertools.zip_longest(range(1000, 2000), deque):
+            self.assertEqual(i, j)
+        while not deque.is_empty():
+            self.assertEqual(next(popped), deque.pop_front())
+        self.assertEqual(MIN_CAPACITY, len(deque.data))
+
+    def test_extend_drop_count(self):
+        deque = Deque()
+        for i in range(10):
+            deque.push_back(i)
+        deque.extend(deque)
+        self.assertEqual(list(range(10)) * 2, list(deque))
+        deque.drop_between(5, 15)
+        self.assertEqual([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], list(deque))
+        self.assertRaises(IndexError, deque.drop_between, 3, 3)
+        self.assertEqual(5, deque.count_if(lambda e: e % 2 == 0))
+        self.assertEqual('Deque([0,1,2,3,4,5,6,7,8,9])', repr(deque))
+        deque.clear()
+        self.assertEqual('Deque([])', repr(deque))
+
+
+    def test_block_deque(self):
+        deque = BlockDeque()
+        for i in range(10 * BLOCK_SIZE):
+            deque.push_back(i)
+            deque.push_front(-i)
+        self.assertEqual(20 * BLOCK_SIZE, len(deque))
+        self.assertEqual(list(range(-10 * BLOCK_SIZE + 1, 1)) + list(range(10 * BLOCK_SIZE)), list(deque))
+
+        # Blocks are released as the deque drains
+        for i in range(19 * BLOCK_SIZE):
+            deque.pop_front()
+        blocks = 0
+        block = deque.first
+        while block is not None:
+            blocks += 1
+            block = block.next
+        self.assertLessEqual(blocks, 2)
+        self.assertEqual(10 * BLOCK_SIZE - 1, deque.pop_back())
+        deque.drop_between(0, 10)
+        self.assertEqual(BLOCK_SIZE - 11, len(deque))
+        self.assertEqual(BLOCK_SIZE - 11, deque.count_if(lambda e: e > 0))
+        while not deque.is_empty():
+            deque.pop_back()
+        self.assertIs(deque.first, deque.last)
+        self.assertRaises(IndexError, deque.pop_front)
+        self.assertEqual('BlockDeque([])', repr(deque))
+
+
+    def test_range_operations(self):
+        for cls in (Deque, BlockDeque):
+            deque = cls()
+            for i in range(MIN_CAPACITY):
+                deque.push_back(i)
+            deque.rotate(3)
+            self.assertEqual([5, 6, 7, 0, 1, 2, 3, 4], list(deque), cls)
+            deque.rotate(-3)
+            self.assertEqual(list(range(8)), list(deque), cls)
+
+            deque.insert_between(2, ['a', 'b'])
+            deque.insert_between(9, ['c'])
+            self.assertEqual([0, 1, 'a', 'b', 2, 3, 4, 5, 6, 'c', 7], list(deque), cls)
+            view = deque.view(2, 5)
+            self.assertEqual(['a', 'b', 2], list(view), cls)
+            self.assertEqual(2, view[-1], cls)
+            self.assertRaises(IndexError, deque.view, 5, 20)
+
+            deque.drop_between(2, 4)
+            deque.drop_between(7, 8)
+            self.assertEqual(list(range(8)), list(deque), cls)
+            deque.insert_between(0, range(200))
+            deque.drop_between(0, 200)
+            self.assertEqual(list(range(8)), list(deque), cls)
+
+            # A view past the end of a shrunken deque fails the same way when iterated or indexed
+            view = deque.view(4, 8)
+            for i in range(3):
+                deque.pop_back()
+            self.assertRaises(IndexError, list, view)
+            self.assertRaises(IndexError, view.__getitem__, 3)
+
+
+    def test_maxlen(self):
+        window = Deque(maxlen=3)
+        buffer = window.data
+        for i in range(10):
+            window.push_back(i)
+        self.assertEqual([7, 8, 9], list(window))
+        self.assertTrue(window.is_full())
+        window.push_front(6)
+        self.assertEqual([6, 7, 8], list(window))
+        self.assertIs(buffer, window.data)
+
+        window = Deque(maxlen=3, overflow=DROP_NEWEST)
+        for i in range(10):
+            window.push_back(i)
+        self.assertEqual([0, 1, 2], list(window))
+        window.insert_between(1, ['a'])
+        self.assertEqual([0, 1, 2], list(window))
+
+        window = Deque(maxlen=2, overflow=RAISE)
+        window.push_back(0)
+        window.push_front(1)
+        self.assertRaises(OverflowError, window.push_back, 2)
+        self.assertRaises(OverflowError, window.insert_between, 0, [2])
+        self.assertEqual([1, 0], list(window))
+        self.assertRaises(ValueError, Deque, 3, 'block')
+
+
+    def test_concurrent_deque(self):
+        deque = ConcurrentDeque(maxlen=4)
+        self.assertRaises(IndexError, deque.pop_front, False)
+        self.assertRaises(IndexError, deque.pop_back, True, 0.01)
+
+        # One producer and one consumer through a bounded, blocking deque
+        received = []
+        consumer = threading.Thread(target=lambda: received.extend(deque.pop_front() for i in range(1000)))
+        consumer.start()
+        for i in range(1000):
+            deque.push_back(i)
+        consumer.join()
+        self.assertEqual(list(range(1000)), received)
+
+        for i in range(4):
+            deque.push_back(i)
+        self.assertRaises(OverflowError, deque.push_front, 4, 0.01)
+        self.assertEqual(0, deque.steal())
+        self.assertEqual(3, deque.pop_back())
+
+    def test_work_stealing_pool(self):
+        done = []
+        lock = threading.Lock()
+
+        def task(depth):
+            if depth > 0:
+                pool.submit(lambda: task(depth - 1))
+                pool.submit(lambda: task(depth - 1))
+            with lock:
+                done.append(depth)
+
+        with WorkStealingPool(4) as pool:
+            pool.submit(lambda: task(6))
+            pool.join()
+            self.assertEqual(2 ** 7 - 1, len(done))
+
+    def test_work_stealing_pool_errors(self):
+        done = []
+
+        def fail():
+            raise ValueError('task failed')
+
+        # Failing tasks are recorded, and every worker lives on to run later tasks
+        with WorkStealingPool(2) as pool:
+            pool.submit(fail)
+            pool.submit(fail)
+            pool.join()
+            for i in range(10):
+                pool.submit(lambda: done.append(1))
+            pool.join()
+        self.assertEqual(10, len(done))
+        self.assertEqual(2, len(pool.errors))
+        self.assertTrue(all(isinstance(error, ValueError) for error in pool.errors))
+        self.assertTrue(not any(thread.is_alive() for thread in pool.threads))
+
+
+    def test_async_deque(self):
+        async def run():
+            deque = AsyncDeque(maxlen=3)
+            received = []
+
+            async def produce(start):
+                for i in range(start, start + 100):
+                    await deque.push_back(i)
+
+            async def consume():
+                for i in range(100):
+                    received.append(await deque.pop_front())
+
+            await asyncio.gather(*[produce(100 * p) for p in range(5)], *[consume() for c in range(5)])
+            self.assertEqual(list(range(500)), sorted(received))
+            self.assertTrue(deque.is_empty())
+
+            # A waiting pop is woken by a later push
+            waiter = asyncio.ensure_future(deque.pop_back())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            await deque.push_front('x')
+            self.assertEqual('x', await waiter)
+
+        asyncio.run(run())
+
+
+    def test_typed_deque(self):
+        deque = _wrapped_typed_deque()
+        self.assertEqual(list(range(-5, 1)) + list(range(6)), list(deque))
+        self.assertEqual(2, len(deque.segments()))
+        self.assertEqual(list(deque), [e for segment in deque.segments() for e in segment])
+
+        view = deque.as_memoryview()
+        self.assertEqual('q', view.format)
+        self.assertEqual(list(deque), view.tolist())
+        view[0] = 42
+        self.assertEqual(42, deque.peek_front())
+        view.release()
+
+        self.assertRaises(TypeError, deque.push_back, 'x')
+        self.assertRaises(TypeError, TypedDeque('d').push_front, None)
+
+
+    def test_typed_deque_bulk(self):
+        deque = _wrapped_typed_deque()
+        values = list(deque)
+
+        self.assertEqual(5, deque.count_if(lambda x: x > 0))
+        evens = deque.filter(lambda x: x % 2 == 0)
+        self.assertEqual([x for x in values if x % 2 == 0], list(evens))
+        deque.map_inplace(lambda x: x * 3)
+        self.assertEqual([x * 3 for x in values], list(deque))
+        deque.map_inplace(lambda x: x // 3)
+        self.assertEqual(values, list(deque))
+
+        self.assertEqual(sum(values), deque.sum())
+        self.assertEqual(-5, deque.min())
+        self.assertEqual(5, deque.max())
+        self.assertEqual(0, TypedDeque().sum())
+
+        # Sums neither wrap around nor lose precision, with or without NumPy
+        big = TypedDeque('q')
+        for i in range(3):
+            big.push_back(2 ** 62)
+        self.assertEqual(3 * 2 ** 62, big.sum())
+        single = TypedDeque('f')
+        for e in (2.0 ** 24, 1.0, 1.0):
+            single.push_back(e)
+        self.assertEqual(2.0 ** 24 + 2, single.sum())
+        self.assertRaises(ValueError, TypedDeque().min)
+
+    @unittest.skipUnless(numpy, 'NumPy is not installed')
+    def test_typed_deque_vectorized(self):
+        deque = _wrapped_typed_deque()
+        values = list(deque)
+
+        # Vectorized functions take whole wrapped segments as NumPy arrays
+        self.assertEqual(2, len(deque.vectors()))
+        self.assertEqual(5, deque.count_if(lambda v: v > 0, vectorized=True))
+        evens = deque.filter(lambda v: v % 2 == 0, vectorized=True)
+        self.assertEqual([x for x in values if x % 2 == 0], list(evens))
+        deque.map_inplace(lambda v: v * 3, vectorized=True)
+        self.assertEqual([x * 3 for x in values], list(deque))
+        self.assertEqual(3 * sum(values), deque.sum())
+
+    @unittest.skipIf(numpy, 'NumPy is installed')
+    def test_typed_deque_vectorized_without_numpy(self):
+        deque = TypedDeque('q')
+        deque.push_back(1)
+        self.assertRaises(ImportError, deque.count_if, lambda v: v > 0, True)
+        self.assertRaises(ImportError, deque.map_inplace, lambda v: v * 2, True)
+        self.assertEqual([1], list(deque))
+
+
+    def test_indexing(self):
+        for cls in (Deque, BlockDeque):
+            deque = cls()
+            for i in range(3 * BLOCK_SIZE):
+                deque.push_front(i)
+            self.assertEqual(3 * BLOCK_SIZE - 1, deque[0], cls)
+            self.assertEqual(0, deque[-1], cls)
+            self.assertEqual(BLOCK_SIZE, deque[-BLOCK_SIZE - 1], cls)
+            self.assertRaises(IndexError, deque.__getitem__, 3 * BLOCK_SIZE)
+            self.assertRaises(IndexError, deque.__getitem__, -3 * BLOCK_SIZE - 1)
+
+            deque[1] = 'x'
+            deque[-2] = 'y'
+            self.assertEqual(['x'], list(deque[1:2]), cls)
+            self.assertEqual(['y', 0], list(deque[-2:]), cls)
+            del deque[1]
+            del deque[-2]
+            self.assertEqual(3 * BLOCK_SIZE - 2, len(deque), cls)
+            self.assertEqual([3 * BLOCK_SIZE - 1] + list(range(3 * BLOCK_SIZE - 3, 1, -1)) + [0], list(deque), cls)
+            self.assertEqual(list(reversed(list(deque))), list(reversed(deque)), cls)
+            self.assertRaises(ValueError, deque.__getitem__, slice(0, 4, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,330 @@
+""" Create a Deque of raw numbers backed by the array module """
+
+######################
+# TypedDeque.py
+######################
+
+# https://docs.python.org/3/library/array.html
+
+from array import array
+
+from Deque import MIN_CAPACITY
+
+# NumPy is optional: vectorized functions get zero-copy ndarrays of each
+# segment and need it, the aggregates only use it to go faster
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TypedDeque:
+    """
+    A double-ended queue of numbers of one declared type
+    Elements are stored unboxed in a circular array.array buffer, and can be
+    handed to other code as memoryviews without creating Python objects
+    """
+
+    def __init__(self, typecode='d'):
+        """
+        Initializes an empty TypedDeque
+        :param typecode: an array module type code, such as 'd' for float
+        or 'q' for 64-bit int
+        """
+
+        self.typecode = typecode
+        self.clear()
+
+    def __len__(self):
+        """
+        Computes the number of elements in the TypedDeque
+        :return: The size of the TypedDeque
+        """
+
+        return self.size
+
+    def peek_front(self):
+        """
+        Looks at, but does not remove, the first element
+        :return: The first element
+        """
+
+        # If TypedDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        return self.data[self.head]
+
+    def peek_back(self):
+        """
+        Looks at, but does not remove, the last element
+        :return: The last element
+        """
+
+        # If TypedDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        return self.data[(self.head + self.size - 1) % len(self.data)]
+
+    def push_front(self, e):
+        """
+        Inserts an element at the front of the TypedDeque
+        :param e: A number of the declared type
+        """
+
+        if self.size == len(self.data):
+            self._resize(2 * len(self.data))
+
+        head = (self.head - 1) % len(self.data)
+        self.data[head] = e
+        self.head = head
+        self.size += 1
+
+    def push_back(self, e):
+        """
+        Inserts an element at the back of the TypedDeque
+        :param e: A number of the declared type
+        """
+
+        if self.size == len(self.data):
+            self._resize(2 * len(self.data))
+
+        self.data[(self.head + self.size) % len(self.data)] = e
+        self.size += 1
+
+    def pop_front(self):
+        """
+        Removes and returns the first element
+        :return: The (former) first element
+        """
+
+        # If TypedDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        e = self.data[self.head]
+        self.head = (self.head + 1) % len(self.data)
+        self.size -= 1
+        self._shrink()
+        return e
+
+    def pop_back(self):
+        """
+        Removes and returns the last element
+        :return: The (former) last element
+        """
+
+        # If TypedDeque is empty, raise an error
+        if self.is_empty():
+            raise IndexError()
+
+        e = self.data[(self.head + self.size - 1) % len(self.data)]
+        self.size -= 1
+        self._shrink()
+        return e
+
+    def clear(self):
+        """
+        Removes all elements from the TypedDeque
+        """
+
+        self.data = array(self.typecode, bytes(MIN_CAPACITY * array(self.typecode).itemsize))
+        self.head = 0
+        self.size = 0
+
+    def __iter__(self):
+        """
+        Iterates over this TypedDeque from front to back
+        :return: An iterator
+        """
+
+        for segment in self.segments():
+            yield from segment
+
+    def extend(self, other):
+        """
+        Takes a deque and adds each of its elements to the back of self
+        :param other: A deque object
+        """
+
+        # Take a snapshot first, so extending a TypedDeque with itself terminates
+        for e in list(other):
+            self.push_back(e)
+
+    def count_if(self, criteria, vectorized=False):
+        """
+        counts how many elements of the TypedDeque satisfy the criteria
+        :param criteria: a bool function that takes an element of the TypedDeque
+        and returns true if that element matches the criteria and false otherwise
+        :param vectorized: if True, criteria instead takes a whole segment as
+        a NumPy array (see vectors) and returns an array of bools
+        """
+
+        if vectorized:
+            return sum(int(numpy.count_nonzero(criteria(vector))) for vector in self.vectors())
+
+        i = 0
+        for e in self:
+            if criteria(e):
+                i += 1
+        return i
+
+    def filter(self, criteria, vectorized=False):
+        """
+        Collects the elements that satisfy the criteria
+        :param criteria: a bool function over one element, or over a whole
+        segment if vectorized is True, as in count_if
+        :param vectorized: whether criteria takes whole segments
+        :return: A new TypedDeque of the matching elements, in order
+        """
+
+        result = TypedDeque(self.typecode)
+        if not vectorized:
+            for e in self:
+                if criteria(e):
+                    result.push_back(e)
+            return result
+
+        kept = array(self.typecode)
+        for vector in self.vectors():
+            kept.frombytes(vector[numpy.asarray(criteria(vector), dtype=bool)].tobytes())
+
+        result.data = kept + array(self.typecode, bytes(max(MIN_CAPACITY - len(kept), 0) * kept.itemsize))
+        result.size = len(kept)
+        return result
+
+    def map_inplace(self, func, vectorized=False):
+        """
+        Replaces every element with func applied to it
+        :param func: a function over one element, or, if vectorized is True,
+        over a whole segment as a NumPy array returning an array of the same length
+        :param vectorized: whether func takes whole segments
+        """
+
+        if vectorized:
+            for vector in self.vectors():
+                vector[:] = func(vector)
+            return
+
+        for segment in self.segments():
+            for i in range(len(segment)):
+                segment[i] = func(segment[i])
+
+    def sum(self):
+        """
+        Adds up the elements a segment at a time
+        :return: The total, 0 if the TypedDeque is empty
+        """
+
+        # NumPy would wrap integer sums around and add 'f' floats in single
+        # precision, so it only adds floats, in double precision
+        if numpy is not None and self.typecode in 'fd':
+            return sum(numpy.asarray(segment).sum(dtype=numpy.float64).item() for segment in self.segments())
+        return sum(sum(segment) for segment in self.segments())
+
+    def min(self):
+        """
+        Finds the smallest element a segment at a time
+        :return: The smallest element
+        """
+
+        # If TypedDeque is empty, raise an error
+        if self.is_empty():
+            raise ValueError('min() of an empty TypedDeque')
+
+        if numpy is not None:
+            return min(numpy.asarray(segment).min().item() for segment in self.segments())
+        return min(min(segment) for segment in self.segments())
+
+    def max(self):
+        """
+        Finds the largest element a segment at a time
+        :return: The largest element
+        """
+
+        # If TypedDeque is empty, raise an error
+        if self.is_empty():
+            raise ValueError('max() of an empty TypedDeque')
+
+        if numpy is not None:
+            return max(numpy.asarray(segment).max().item() for segment in self.segments())
+        return max(max(segment) for segment in self.segments())
+
+    def segments(self):
+        """
+        Views the elements in place, front to back, as at most two memoryviews
+        (two when the elements wrap around the end of the buffer)
+        The views are only valid until the TypedDeque is next changed
+        :return: A list of memoryviews
+        """
+
+        end = min(self.head + self.size, len(self.data))
+        view = memoryview(self.data)
+        segments = [view[self.head:end], view[0:self.size - (end - self.head)]]
+        return [segment for segment in segments if len(segment)]
+
+    def vectors(self):
+        """
+        The segments in the form handed to vectorized functions: NumPy arrays
+        sharing the TypedDeque's memory
+        :return: A list of at most two NumPy arrays
+        """
+
+        if numpy is None:
+            raise ImportError('vectorized TypedDeque functions need NumPy')
+        return [numpy.asarray(segment) for segment in self.segments()]
+
+    def as_memoryview(self):
+        """
+        Views all the elements as one contiguous memoryview, unwrapping the
+        buffer first if the elements wrap around its end
+        The view is only valid until the TypedDeque is next changed
+        :return: A memoryview
+        """
+
+        if self.head + self.size > len(self.data):
+            self._resize(len(self.data))
+
+        return memoryview(self.data)[self.head:self.head + self.size]
+
+    # provided functions
+
+    def is_empty(self):
+        """
+        Checks if the TypedDeque is empty
+        :return: True if the TypedDeque contains no elements, False otherwise
+        """
+        return len(self) == 0
+
+    def __repr__(self):
+        """
+        A string representation of this TypedDeque
+        :return: A string
+        """
+        return 'TypedDeque({0!r}, [{1}])'.format(self.typecode, ','.join(str(item) for item in self))
+
+    # Helper functions
+
+    def _resize(self, capacity):
+        """
+        Moves the elements into a new buffer, unwrapped to start at index 0
+        Whole segments are copied at once, without boxing the elements
+        :param capacity: the number of slots in the new buffer
+        """
+
+        data = array(self.typecode, bytes(capacity * self.data.itemsize))
+        end = min(self.head + self.size, len(self.data))
+        data[0:end - self.head] = self.data[self.head:end]
+        data[end - self.head:self.size] = self.data[0:self.size - (end - self.head)]
+        self.data = data
+        self.head = 0
+
+    def _shrink(self):
+        """
+        Halves the buffer once it is only a quarter full
+        """
+
+        if len(self.data) > MIN_CAPACITY and self.size <= len(self.data) // 4:
+            self._resize(max(MIN_CAPACITY, len(self.data) // 2))
+